@@ -5,34 +5,119 @@ CMS "Create Social Profiles" button → POST /webhook/create-profiles
 Returns FB Page URL, YT Channel URL, IG Profile URL back to CMS
 """
 from __future__ import annotations
-import asyncio, hashlib, hmac, json, os, sys
+import asyncio, hashlib, hmac, os, sys, time
+from contextlib import asynccontextmanager
 from pathlib import Path
 
+import httpx
+import orjson
 from fastapi import FastAPI, Request, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from config.settings import WEBHOOK_SECRET, CMS_CALLBACK_URL
 from db.models import init_db, get_session, TitleProfile
-from workers.facebook_worker import create_fb_page
+from workers.facebook_worker import create_fb_page, fb_browser
 
-app = FastAPI(title="STAGE Social Creator API")
+WEBHOOK_SECRET_BYTES = WEBHOOK_SECRET.encode()
+# Keyed HMAC state (ipad/opad already absorbed) — verify_signature only .copy()s it
+_HMAC_TEMPLATE = hmac.new(WEBHOOK_SECRET_BYTES, b"", hashlib.sha256) if WEBHOOK_SECRET else None
+_SIG_PREFIX = "sha256="
+_SIG_LEN = len(_SIG_PREFIX) + 2 * hashlib.sha256().digest_size   # 71
 
-# Init DB on startup
-@app.on_event("startup")
-async def startup():
+# title_id → "already_exists" response. CMS retries the same title a lot;
+# a hit here skips the SQLite lookup entirely.
+_IDEM_TTL = 60        # seconds
+_IDEM_MAX = 10_000
+_idem_cache: dict[str, tuple[float, dict]] = {}
+
+
+def _idem_get(title_id: str) -> dict | None:
+    hit = _idem_cache.get(title_id)
+    if hit and time.monotonic() - hit[0] < _IDEM_TTL:
+        return hit[1]
+    return None
+
+
+def _idem_put(title_id: str, fb_page_url: str | None):
+    if len(_idem_cache) >= _IDEM_MAX:
+        _idem_cache.clear()
+    _idem_cache[title_id] = (time.monotonic(), {
+        "status": "already_exists",
+        "title_id": title_id,
+        "fb_page_url": fb_page_url,
+    })
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build every process-wide singleton once; tear them down on shutdown."""
     init_db()
     print("[API] Database initialized ✓")
+    # One pooled client for all CMS callbacks — keep-alive, no TLS handshake per call
+    async with httpx.AsyncClient(
+        timeout=10,
+        limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=30),
+    ) as http_client:
+        app.state.http_client = http_client
+        app.state.browser = app.state.browser_cm = None
+        try:
+            yield
+        finally:
+            await _close_browser()
+
+
+# One Camoufox browser per process — each FB job only opens a new context. Launched
+# lazily so /health etc. come up even if Camoufox can't start, and relaunched if it dies.
+_browser_lock = asyncio.Lock()
+
+
+async def _close_browser():
+    cm, app.state.browser, app.state.browser_cm = app.state.browser_cm, None, None
+    if cm is not None:
+        try:
+            await cm.__aexit__(None, None, None)
+        except Exception as e:
+            print(f"[API] Camoufox close failed: {e}")
+
+
+async def _get_browser():
+    async with _browser_lock:
+        browser = app.state.browser
+        if browser is not None and browser.is_connected():
+            return browser
+        if browser is not None:
+            print("[API] Camoufox browser disconnected — relaunching")
+        await _close_browser()
+        cm = fb_browser()
+        app.state.browser = await cm.__aenter__()
+        app.state.browser_cm = cm
+        print("[API] Camoufox browser launched ✓")
+        return app.state.browser
+
+
+app = FastAPI(
+    title="STAGE Social Creator API",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 
 def verify_signature(body: bytes, signature: str) -> bool:
     """HMAC-SHA256 signature verification"""
     if not WEBHOOK_SECRET:
         return True  # Skip verification if not configured
-    expected = hmac.new(
-        WEBHOOK_SECRET.encode(), body, hashlib.sha256
-    ).hexdigest()
-    return hmac.compare_digest(f"sha256={expected}", signature)
+    # Shape check first — malformed headers never pay for an HMAC over the body
+    if len(signature) != _SIG_LEN or not signature.startswith(_SIG_PREFIX):
+        return False
+    try:
+        provided = bytes.fromhex(signature[len(_SIG_PREFIX):])
+    except ValueError:
+        return False
+    mac = _HMAC_TEMPLATE.copy()
+    mac.update(body)
+    expected = mac.digest()
+    return hmac.compare_digest(expected, provided)
 
 
 async def _create_profiles_task(title_id: str, title_name: str, title_type: str):
@@ -41,13 +126,16 @@ async def _create_profiles_task(title_id: str, title_name: str, title_type: str)
 
     # ── Facebook Page ────────────────────────────────────────────────────────
     try:
-        fb_result = await create_fb_page(title_name, title_id)
+        browser = await _get_browser()
+        fb_result = await create_fb_page(title_name, title_id, browser=browser)
         results["facebook"] = {
             "status": "created",
             "page_id": fb_result.get("page_id"),
             "page_url": fb_result.get("page_url"),
         }
         print(f"[API] FB Page created: {fb_result.get('page_url')}")
+        if fb_result.get("page_id"):
+            _idem_put(title_id, fb_result.get("page_url"))
     except Exception as e:
         results["facebook"] = {"status": "failed", "error": str(e)}
         print(f"[API] FB Page failed: {e}")
@@ -61,9 +149,7 @@ async def _create_profiles_task(title_id: str, title_name: str, title_type: str)
     # ── Callback to CMS ─────────────────────────────────────────────────────
     if CMS_CALLBACK_URL:
         try:
-            import httpx
-            async with httpx.AsyncClient() as client:
-                await client.post(CMS_CALLBACK_URL, json=results, timeout=10)
+            await app.state.http_client.post(CMS_CALLBACK_URL, json=results)
             print(f"[API] CMS callback sent ✓")
         except Exception as e:
             print(f"[API] CMS callback failed: {e}")
@@ -90,7 +176,7 @@ async def create_profiles(request: Request, background_tasks: BackgroundTasks):
     if sig and not verify_signature(body, sig):
         raise HTTPException(status_code=401, detail="Invalid signature")
 
-    payload = json.loads(body)
+    payload = orjson.loads(body)
     title_id = payload.get("title_id")
     title_name = payload.get("title_name")
     title_type = payload.get("title_type", "content")
@@ -99,23 +185,24 @@ async def create_profiles(request: Request, background_tasks: BackgroundTasks):
         raise HTTPException(status_code=400, detail="title_id and title_name required")
 
     # Check idempotency — don't create twice for same title
+    cached = _idem_get(title_id)
+    if cached:
+        return ORJSONResponse(cached)
+
     session = get_session()
     existing = session.query(TitleProfile).filter_by(title_id=title_id).first()
     session.close()
 
     if existing and existing.fb_page_id:
-        return JSONResponse({
-            "status": "already_exists",
-            "title_id": title_id,
-            "fb_page_url": existing.fb_page_url,
-        })
+        _idem_put(title_id, existing.fb_page_url)
+        return ORJSONResponse(_idem_get(title_id))
 
     # Run creation in background — return immediately to CMS
     background_tasks.add_task(
         _create_profiles_task, title_id, title_name, title_type
     )
 
-    return JSONResponse({
+    return ORJSONResponse({
         "status": "creating",
         "title_id": title_id,
         "message": "Social profiles creation started. CMS will be notified when done.",
@@ -127,7 +214,11 @@ async def get_status(title_id: str):
     """Check creation status for a title"""
     session = get_session()
     try:
-        profile = session.query(TitleProfile).filter_by(title_id=title_id).first()
+        # Only the columns the response needs — one round-trip, no ORM entity hydration
+        profile = session.query(
+            TitleProfile.title_name, TitleProfile.status, TitleProfile.fb_page_url,
+            TitleProfile.yt_channel_url, TitleProfile.ig_username,
+        ).filter_by(title_id=title_id).first()
         if not profile:
             raise HTTPException(status_code=404, detail="Title not found")
         return {
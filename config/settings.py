@@ -15,6 +15,7 @@ CHROME_PROFILE_DIR = os.getenv("CHROME_PROFILE_DIR", str(Path.home() / ".chrome-
 CDP_URL = f"http://localhost:{CHROME_DEBUG_PORT}"
 
 FB_COOKIES_FILE = os.getenv("FB_COOKIES_FILE", str(CONFIG_DIR / "fb_cookies.json"))
+FB_WORKER_GEOIP = os.getenv("FB_WORKER_GEOIP", "0") == "1"   # geoip lookup adds 1-3s per launch
 META_APP_ID = os.getenv("META_APP_ID", "")
 META_APP_SECRET = os.getenv("META_APP_SECRET", "")
 META_SYSTEM_USER_TOKEN = os.getenv("META_SYSTEM_USER_TOKEN", "")
@@ -26,6 +27,7 @@ PROXY_PASSWORD = os.getenv("PROXY_PASSWORD", "")
 
 DB_PATH = os.getenv("DB_PATH", str(DATA_DIR / "stage_social.db"))
 DB_URL = f"sqlite:///{DB_PATH}"
+SQLALCHEMY_ECHO = os.getenv("SQLALCHEMY_ECHO", "") == "1"   # dev: log every ORM query
 
 WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")
 WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8000"))
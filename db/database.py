@@ -13,18 +13,25 @@ Usage:
     db.get_job(job_id)
 """
 
+import os
 import sqlite3
-import json
+import orjson
 import time
 import logging
+import threading
 from dataclasses import dataclass, asdict
 from typing import Optional
 from contextlib import contextmanager
 
+from workers.naming_engine import SocialHandles
+
 log = logging.getLogger(__name__)
 
 DEFAULT_DB_PATH = "stage_social.db"
 
+# Dev-only: STAGE_PROFILE=1 logs every SQL statement DB() issues (spot N+1 patterns)
+PROFILE_SQL = bool(os.getenv("STAGE_PROFILE"))
+
 SCHEMA = """
 CREATE TABLE IF NOT EXISTS profiles (
     id              INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -72,104 +79,169 @@ CREATE TABLE IF NOT EXISTS profiles (
 
 CREATE INDEX IF NOT EXISTS idx_slug   ON profiles(slug);
 CREATE INDEX IF NOT EXISTS idx_status ON profiles(status);
+-- list_jobs(status=...) ORDER BY id DESC served straight from the index, no sort step
+CREATE INDEX IF NOT EXISTS idx_status_id ON profiles(status, id DESC);
 """
 
+CONNECTION_PRAGMAS = """
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+PRAGMA cache_size=-20000;
+"""
 
-@contextmanager
-def _conn(db_path: str):
-    con = sqlite3.connect(db_path)
-    con.row_factory = sqlite3.Row
-    try:
-        yield con
-        con.commit()
-    except Exception:
-        con.rollback()
-        raise
-    finally:
-        con.close()
+# ── Fixed UPDATE shapes — constant SQL text so sqlite3's statement cache reuses the plan
+SQL_UPDATE_FB_DONE = (
+    "UPDATE profiles SET fb_status = 'done', fb_page_id = ?, fb_url = ?, "
+    "fb_page_name = ?, updated_at = ? WHERE id = ?"
+)
+SQL_UPDATE_FB_FAIL = "UPDATE profiles SET fb_status = 'failed', fb_error = ?, updated_at = ? WHERE id = ?"
+SQL_UPDATE_YT_DONE = (
+    "UPDATE profiles SET yt_status = 'done', yt_channel_id = ?, yt_url = ?, "
+    "yt_channel_name = ?, yt_handle = ?, updated_at = ? WHERE id = ?"
+)
+SQL_UPDATE_YT_FAIL = "UPDATE profiles SET yt_status = 'failed', yt_error = ?, updated_at = ? WHERE id = ?"
+SQL_UPDATE_IG_CREATED = (
+    "UPDATE profiles SET ig_status = 'warming_up', ig_handle = ?, ig_username = ?, "
+    "ig_password = ?, ig_phone = ?, ig_device_id = ?, ig_warmup_status = ?, "
+    "ig_url = ?, updated_at = ? WHERE id = ?"
+)
+SQL_UPDATE_IG_FAIL = "UPDATE profiles SET ig_status = 'failed', ig_error = ?, updated_at = ? WHERE id = ?"
+SQL_UPDATE_STATUS  = "UPDATE profiles SET status = ?, updated_at = ? WHERE id = ?"
+
+
+# ── Summary reads — only the columns _summarize_row uses (skips handles_json, passwords, …)
+SUMMARY_COLUMNS = (
+    "id, title, status, fb_status, fb_page_name, fb_url, "
+    "yt_status, yt_channel_name, yt_handle, yt_url, "
+    "ig_status, ig_handle, ig_warmup_day, ig_warmup_status, ig_url"
+)
+SQL_SUMMARY_BY_ID       = f"SELECT {SUMMARY_COLUMNS} FROM profiles WHERE id = ?"
+SQL_SUMMARIES           = f"SELECT {SUMMARY_COLUMNS} FROM profiles ORDER BY id DESC"
+SQL_SUMMARIES_BY_STATUS = f"SELECT {SUMMARY_COLUMNS} FROM profiles WHERE status = ? ORDER BY id DESC"
+
+
+# DB files whose schema has already been applied in this process
+_initialized: set[str] = set()
+_init_lock = threading.Lock()
 
 
 class DB:
     def __init__(self, db_path: str = DEFAULT_DB_PATH):
         self.db_path = db_path
+        self._local = threading.local()   # one sqlite3 connection per thread
         self._init()
 
     def _init(self):
-        with _conn(self.db_path) as con:
-            con.executescript(SCHEMA)
+        with _init_lock:
+            if self.db_path in _initialized:
+                return
+            with self._conn() as con:
+                con.executescript(SCHEMA)
+                # WAL persists in the DB file — readers no longer block on FB/YT writers
+                con.execute("PRAGMA journal_mode=WAL")
+            _initialized.add(self.db_path)
+
+    def _connection(self) -> sqlite3.Connection:
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = sqlite3.connect(self.db_path, check_same_thread=False)
+            con.row_factory = sqlite3.Row
+            # Per-connection tuning: one fsync per commit under WAL, temp tables in RAM
+            con.executescript(CONNECTION_PRAGMAS)
+            if PROFILE_SQL:
+                con.set_trace_callback(lambda sql: log.info(f"[sql] {sql}"))
+            self._local.con = con
+        return con
+
+    @contextmanager
+    def _conn(self):
+        con = self._connection()
+        try:
+            yield con
+            con.commit()
+        except Exception:
+            con.rollback()
+            raise
+
+    def close(self):
+        con = getattr(self._local, "con", None)
+        if con is not None:
+            con.close()
+            self._local.con = None
 
     def _now(self) -> int:
         return int(time.time())
 
     # ── Create ────────────────────────────────────────────────────────────────
 
-    def create_job(self, title: str, handles) -> int:
+    def create_job(self, title: str, handles, handles_json: Optional[str] = None) -> int:
         """
         Create a new profile creation job.
+        handles_json: pre-serialized handles, if the caller already has it.
         Returns the job ID.
         """
-        from workers.naming_engine import SocialHandles
-        handles_dict = handles.as_dict() if isinstance(handles, SocialHandles) else handles
-        slug = handles_dict.get("slug", title.lower().replace(" ", "-"))
+        if isinstance(handles, SocialHandles):
+            slug = handles.slug
+            handles_json = handles_json or handles.as_json
+        else:
+            slug = handles.get("slug", title.lower().replace(" ", "-"))
+            handles_json = handles_json or orjson.dumps(handles).decode()
         now  = self._now()
 
-        with _conn(self.db_path) as con:
+        with self._conn() as con:
             cur = con.execute(
                 """
                 INSERT INTO profiles
                   (title, slug, handles_json, status, created_at, updated_at)
                 VALUES (?, ?, ?, 'pending', ?, ?)
                 """,
-                (title, slug, json.dumps(handles_dict, ensure_ascii=False), now, now),
+                (title, slug, handles_json, now, now),
             )
             return cur.lastrowid
 
     # ── Updates ───────────────────────────────────────────────────────────────
 
     def _update(self, job_id: int, **kwargs):
+        """Ad-hoc UPDATE for rare transitions — hot paths use the SQL_UPDATE_* constants."""
         kwargs["updated_at"] = self._now()
         cols  = ", ".join(f"{k} = ?" for k in kwargs)
         vals  = list(kwargs.values()) + [job_id]
-        with _conn(self.db_path) as con:
+        with self._conn() as con:
             con.execute(f"UPDATE profiles SET {cols} WHERE id = ?", vals)
 
+    def _execute(self, sql: str, params: tuple):
+        with self._conn() as con:
+            con.execute(sql, params)
+
     def update_fb(self, job_id: int, page_id: str, page_url: str, page_name: str):
-        self._update(job_id,
-                     fb_status="done", fb_page_id=page_id,
-                     fb_url=page_url, fb_page_name=page_name)
+        self._execute(SQL_UPDATE_FB_DONE,
+                      (page_id, page_url, page_name, self._now(), job_id))
         log.info(f"[job {job_id}] FB done: {page_url}")
 
     def fail_fb(self, job_id: int, error: str):
-        self._update(job_id, fb_status="failed", fb_error=error)
+        self._execute(SQL_UPDATE_FB_FAIL, (error, self._now(), job_id))
 
     def update_yt(self, job_id: int, channel_id: str, channel_url: str,
                   channel_name: str, handle: Optional[str]):
-        self._update(job_id,
-                     yt_status="done", yt_channel_id=channel_id,
-                     yt_url=channel_url, yt_channel_name=channel_name,
-                     yt_handle=handle)
+        self._execute(SQL_UPDATE_YT_DONE,
+                      (channel_id, channel_url, channel_name, handle, self._now(), job_id))
         log.info(f"[job {job_id}] YT done: {channel_url}")
 
     def fail_yt(self, job_id: int, error: str):
-        self._update(job_id, yt_status="failed", yt_error=error)
+        self._execute(SQL_UPDATE_YT_FAIL, (error, self._now(), job_id))
 
     def update_ig_created(self, job_id: int, ig_username: str, ig_password: str,
                           ig_phone: str, device_id: str, warmup_status: str):
         handle = f"@{ig_username}"
         ig_url = f"https://instagram.com/{ig_username}"
-        self._update(job_id,
-                     ig_status="warming_up",
-                     ig_handle=handle,
-                     ig_username=ig_username,
-                     ig_password=ig_password,
-                     ig_phone=ig_phone,
-                     ig_device_id=device_id,
-                     ig_warmup_status=warmup_status,
-                     ig_url=ig_url)
+        self._execute(SQL_UPDATE_IG_CREATED,
+                      (handle, ig_username, ig_password, ig_phone, device_id,
+                       warmup_status, ig_url, self._now(), job_id))
         log.info(f"[job {job_id}] IG created: {handle}")
 
     def fail_ig(self, job_id: int, error: str):
-        self._update(job_id, ig_status="failed", ig_error=error)
+        self._execute(SQL_UPDATE_IG_FAIL, (error, self._now(), job_id))
 
     def update_ig_warmup_day(self, job_id: int, day: int):
         self._update(job_id, ig_warmup_day=day)
@@ -183,25 +255,25 @@ class DB:
         self._update(job_id, status="done", completed_at=now)
 
     def mark_failed(self, job_id: int):
-        self._update(job_id, status="failed")
+        self._execute(SQL_UPDATE_STATUS, ("failed", self._now(), job_id))
 
     def set_status(self, job_id: int, status: str):
-        self._update(job_id, status=status)
+        self._execute(SQL_UPDATE_STATUS, (status, self._now(), job_id))
 
     # ── Reads ─────────────────────────────────────────────────────────────────
 
     def get_job(self, job_id: int) -> Optional[dict]:
-        with _conn(self.db_path) as con:
+        with self._conn() as con:
             row = con.execute("SELECT * FROM profiles WHERE id = ?", (job_id,)).fetchone()
             return dict(row) if row else None
 
     def get_by_slug(self, slug: str) -> Optional[dict]:
-        with _conn(self.db_path) as con:
+        with self._conn() as con:
             row = con.execute("SELECT * FROM profiles WHERE slug = ?", (slug,)).fetchone()
             return dict(row) if row else None
 
     def list_jobs(self, status: Optional[str] = None) -> list[dict]:
-        with _conn(self.db_path) as con:
+        with self._conn() as con:
             if status:
                 rows = con.execute("SELECT * FROM profiles WHERE status = ? ORDER BY id DESC", (status,)).fetchall()
             else:
@@ -210,32 +282,53 @@ class DB:
 
     def summary(self, job_id: int) -> dict:
         """Return a clean summary dict suitable for API response."""
-        job = self.get_job(job_id)
-        if not job:
-            return {}
-        return {
-            "job_id":  job_id,
-            "title":   job["title"],
-            "status":  job["status"],
-            "facebook": {
-                "status":   job["fb_status"],
-                "page_name": job["fb_page_name"],
-                "url":      job["fb_url"],
-            },
-            "youtube": {
-                "status":       job["yt_status"],
-                "channel_name": job["yt_channel_name"],
-                "handle":       job["yt_handle"],
-                "url":          job["yt_url"],
-            },
-            "instagram": {
-                "status":        job["ig_status"],
-                "handle":        job["ig_handle"],
-                "warmup_day":    job["ig_warmup_day"],
-                "warmup_status": job["ig_warmup_status"],
-                "url":           job["ig_url"],
-            },
-        }
+        with self._conn() as con:
+            row = _tuple_cursor(con).execute(SQL_SUMMARY_BY_ID, (job_id,)).fetchone()
+            return _summarize_row(row) if row else {}
+
+    def list_summaries(self, status: Optional[str] = None) -> list[dict]:
+        """Summaries for many jobs from a single SELECT (no per-job get_job)."""
+        with self._conn() as con:
+            cur = _tuple_cursor(con)
+            if status:
+                rows = cur.execute(SQL_SUMMARIES_BY_STATUS, (status,)).fetchall()
+            else:
+                rows = cur.execute(SQL_SUMMARIES).fetchall()
+            return [_summarize_row(r) for r in rows]
+
+
+def _tuple_cursor(con: sqlite3.Connection) -> sqlite3.Cursor:
+    """Cursor returning plain tuples — no sqlite3.Row wrapper on hot reads."""
+    cur = con.cursor()
+    cur.row_factory = None
+    return cur
+
+
+def _summarize_row(r: tuple) -> dict:
+    """Map a SUMMARY_COLUMNS tuple to the API summary shape (positions follow SUMMARY_COLUMNS)."""
+    return {
+        "job_id":  r[0],
+        "title":   r[1],
+        "status":  r[2],
+        "facebook": {
+            "status":   r[3],
+            "page_name": r[4],
+            "url":      r[5],
+        },
+        "youtube": {
+            "status":       r[6],
+            "channel_name": r[7],
+            "handle":       r[8],
+            "url":          r[9],
+        },
+        "instagram": {
+            "status":        r[10],
+            "handle":        r[11],
+            "warmup_day":    r[12],
+            "warmup_status": r[13],
+            "url":           r[14],
+        },
+    }
 
 
 # ── CLI test ──────────────────────────────────────────────────────────────────
@@ -3,12 +3,19 @@ Database schema — designed by Sigma (Pool Database Architect)
 Account lifecycle: CREATED → WARMING → READY → ASSIGNED → IN_USE → RETIRED
 """
 from __future__ import annotations
-from sqlalchemy import create_engine, Column, String, Integer, DateTime, Text, Float
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy import create_engine, insert, String, Integer, DateTime, Text, Float, Index
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker, scoped_session
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from datetime import datetime, timezone
+from typing import Optional
 import sys, os
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
-from config.settings import DB_URL
+from config.settings import DB_URL, SQLALCHEMY_ECHO
+
+
+def _utcnow() -> datetime:
+    """Shared column default/onupdate — one function instead of a lambda per column."""
+    return datetime.now(timezone.utc)
 
 
 class Base(DeclarativeBase):
@@ -19,96 +26,169 @@ class TitleProfile(Base):
     """One row per STAGE title (movie/series/microdrama)"""
     __tablename__ = "title_profiles"
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    title_id = Column(String, unique=True, nullable=False)   # CMS title ID
-    title_name = Column(String, nullable=False)              # Raw name from CMS
-    title_type = Column(String, nullable=False)              # movie/series/microdrama
-    handle = Column(String)                                  # Generated social handle
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    title_id: Mapped[str] = mapped_column(String(64), unique=True)      # CMS title ID
+    title_name: Mapped[str] = mapped_column(String(200))                # Raw name from CMS
+    title_type: Mapped[str] = mapped_column(String(32))                 # movie/series/microdrama
+    handle: Mapped[Optional[str]] = mapped_column(String(64))           # Generated social handle
 
     # Platform account IDs
-    fb_page_id = Column(String)
-    fb_page_url = Column(String)
-    yt_channel_id = Column(String)
-    yt_channel_url = Column(String)
-    ig_account_id = Column(String)
-    ig_username = Column(String)
+    fb_page_id: Mapped[Optional[str]] = mapped_column(String(32))
+    fb_page_url: Mapped[Optional[str]] = mapped_column(String(255))
+    yt_channel_id: Mapped[Optional[str]] = mapped_column(String(32))
+    yt_channel_url: Mapped[Optional[str]] = mapped_column(String(255))
+    ig_account_id: Mapped[Optional[str]] = mapped_column(String(32))
+    ig_username: Mapped[Optional[str]] = mapped_column(String(64))
 
     # Status
-    status = Column(String, default="pending")               # pending/creating/done/failed
-    error_message = Column(Text)
+    status: Mapped[Optional[str]] = mapped_column(String(32), default="pending", index=True)  # pending/creating/done/failed
+    error_message: Mapped[Optional[str]] = mapped_column(Text)
 
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc),
-                        onupdate=lambda: datetime.now(timezone.utc))
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=_utcnow)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=_utcnow,
+                                                           onupdate=_utcnow)
 
 
 class TokenVault(Base):
     """Stores all platform tokens — never put tokens in code or logs"""
     __tablename__ = "token_vault"
+    __table_args__ = (
+        Index("ix_token_title_platform", "title_id", "platform"),
+    )
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    title_id = Column(String, nullable=False)
-    platform = Column(String, nullable=False)                # facebook/instagram/youtube
-    token_type = Column(String, nullable=False)              # page_token/system_user/oauth_refresh
-    token_value = Column(Text, nullable=False)
-    expires_at = Column(DateTime)                            # NULL = never expires
-    last_refreshed_at = Column(DateTime)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    title_id: Mapped[str] = mapped_column(String(64))
+    platform: Mapped[str] = mapped_column(String(16))                   # facebook/instagram/youtube
+    token_type: Mapped[str] = mapped_column(String(32))                 # page_token/system_user/oauth_refresh
+    token_value: Mapped[str] = mapped_column(Text)
+    expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime)    # NULL = never expires
+    last_refreshed_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=_utcnow)
 
 
 class InstagramPool(Base):
     """Instagram pre-created account pool"""
     __tablename__ = "instagram_pool"
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    username = Column(String, unique=True, nullable=False)
-    password = Column(Text, nullable=False)
-    email = Column(String)
-    phone_number = Column(String)
-    geelark_device_id = Column(String)
-    cookies_file = Column(String)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    username: Mapped[str] = mapped_column(String(64), unique=True)
+    password: Mapped[str] = mapped_column(Text)
+    email: Mapped[Optional[str]] = mapped_column(String(255))
+    phone_number: Mapped[Optional[str]] = mapped_column(String(32))
+    geelark_device_id: Mapped[Optional[str]] = mapped_column(String(64))
+    cookies_file: Mapped[Optional[str]] = mapped_column(String(255))
 
-    status = Column(String, default="created")  # created/warming/ready/assigned/retired
-    health_score = Column(Float, default=100.0)
-    assigned_title_id = Column(String)
+    status: Mapped[Optional[str]] = mapped_column(String(16), default="created", index=True)  # created/warming/ready/assigned/retired
+    health_score: Mapped[Optional[float]] = mapped_column(Float, default=100.0)
+    assigned_title_id: Mapped[Optional[str]] = mapped_column(String(64), index=True)
 
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-    warmed_at = Column(DateTime)
-    assigned_at = Column(DateTime)
-    last_rename_at = Column(DateTime)
-    rename_count = Column(Integer, default=0)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=_utcnow)
+    warmed_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    assigned_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    last_rename_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    rename_count: Mapped[Optional[int]] = mapped_column(Integer, default=0)
 
 
 class WarmupLog(Base):
     """Log of warmup actions per Instagram account"""
     __tablename__ = "warmup_log"
+    __table_args__ = (
+        Index("ix_warmup_account_time", "account_id", "performed_at"),
+    )
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    account_id = Column(Integer, nullable=False)
-    action_type = Column(String, nullable=False)  # follow/like/browse/story_view
-    performed_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-    success = Column(Integer, default=1)  # 1=success, 0=failed
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    account_id: Mapped[int] = mapped_column(Integer)
+    action_type: Mapped[str] = mapped_column(String(32))  # follow/like/browse/story_view
+    performed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=_utcnow)
+    success: Mapped[Optional[int]] = mapped_column(Integer, default=1)  # 1=success, 0=failed
 
 
 class EventLog(Base):
     """Full audit trail of every action"""
     __tablename__ = "event_log"
+    __table_args__ = (
+        Index("ix_event_entity", "entity_type", "entity_id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    entity_type: Mapped[str] = mapped_column(String(32))   # title/ig_account
+    entity_id: Mapped[str] = mapped_column(String(64))
+    event_type: Mapped[str] = mapped_column(String(64))    # fb_page_created/ig_assigned/token_saved etc
+    event_data: Mapped[Optional[str]] = mapped_column(Text)  # JSON
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=_utcnow)
+
+
+# One Engine (and its connection pool) per process — built lazily on first use
+_engine = None
+# expire_on_commit=False: attributes stay loaded after commit, no hidden re-SELECT
+_Session = sessionmaker(expire_on_commit=False)
+
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    entity_type = Column(String, nullable=False)   # title/ig_account
-    entity_id = Column(String, nullable=False)
-    event_type = Column(String, nullable=False)    # fb_page_created/ig_assigned/token_saved etc
-    event_data = Column(Text)                      # JSON
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+def get_engine():
+    global _engine
+    if _engine is None:
+        _engine = create_engine(
+            DB_URL,
+            connect_args={"check_same_thread": False},   # pooled conns hop threads
+            pool_pre_ping=True,
+            echo=SQLALCHEMY_ECHO,
+        )
+        _Session.configure(bind=_engine)
+    return _engine
 
 
 def init_db():
-    engine = create_engine(DB_URL)
+    engine = get_engine()
     Base.metadata.create_all(engine)
+    # create_all skips indexes on tables that already exist — add any missing ones
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
     return engine
 
 
 def get_session():
-    engine = create_engine(DB_URL)
-    Session = sessionmaker(bind=engine)
-    return Session()
+    get_engine()
+    return _Session()
+
+
+# Thread-local session for CLI workers that make several writes per job.
+# Scripts using it must call SessionLocal.remove() on exit.
+SessionLocal = scoped_session(get_session)
+
+
+def upsert_title(session, title_id: str, title_name: str,
+                 title_type: str = "content", **fields):
+    """
+    INSERT … ON CONFLICT(title_id) DO UPDATE for TitleProfile — one statement
+    instead of SELECT-then-INSERT/UPDATE. Only `fields` are overwritten on conflict.
+    Caller commits.
+    """
+    fields["updated_at"] = _utcnow()
+    stmt = sqlite_insert(TitleProfile).values(
+        title_id=title_id, title_name=title_name, title_type=title_type, **fields,
+    )
+    session.execute(stmt.on_conflict_do_update(index_elements=["title_id"], set_=fields))
+
+
+class AuditBuffer:
+    """
+    Collects EventLog rows during a job and writes them in one bulk INSERT.
+    flush() only executes — the caller commits, so audit rows land in the
+    same transaction as the writes they describe.
+    """
+
+    def __init__(self):
+        self.rows: list[dict] = []
+
+    def log(self, entity_type: str, entity_id: str, event_type: str,
+            event_data: Optional[str] = None):
+        self.rows.append({
+            "entity_type": entity_type, "entity_id": entity_id,
+            "event_type": event_type, "event_data": event_data,
+        })
+
+    def flush(self, session):
+        if self.rows:
+            session.execute(insert(EventLog), self.rows)
+            self.rows.clear()
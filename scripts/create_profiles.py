@@ -10,7 +10,8 @@ Usage:
 """
 
 import argparse
-import json
+import asyncio
+import orjson
 import logging
 import sys
 import os
@@ -25,6 +26,60 @@ logging.basicConfig(
 )
 log = logging.getLogger(__name__)
 
+def _pretty(obj) -> str:
+    """Indented JSON for console output (orjson keeps Devanagari as-is, like ensure_ascii=False)."""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+
+
+JOBS_DIR = "/tmp/stage_jobs"   # per-job screenshot dirs live under here
+
+
+def _job_dir(job_id: int) -> str:
+    """One mkdir per job — the parent is created once, not re-walked every time."""
+    path = f"{JOBS_DIR}/{job_id}"
+    try:
+        os.mkdir(path)
+    except FileNotFoundError:
+        os.makedirs(JOBS_DIR, exist_ok=True)
+        os.mkdir(path)
+    except FileExistsError:
+        pass
+    return path
+
+
+def _fb_worker(args, handles, screenshot_dir: str):
+    # Imported here, inside the worker thread: a broken import only fails FB, YT still runs
+    from workers.facebook_worker import create_facebook_page
+    from config.settings import FB_CATEGORY
+    return create_facebook_page(
+        page_name     = handles.fb_page_name,
+        category      = FB_CATEGORY,
+        cdp_url       = args.cdp_url,
+        screenshot_dir= screenshot_dir,
+    )
+
+
+def _yt_worker(args, handles, screenshot_dir: str):
+    from workers.youtube_worker import create_youtube_channel
+    return create_youtube_channel(
+        channel_name  = handles.yt_channel_name,
+        cdp_url       = args.cdp_url,
+        screenshot_dir= screenshot_dir,
+    )
+
+
+async def _create_fb_yt(args, handles, screenshot_dir: str) -> dict:
+    """Run the FB + YT browser workers side by side — both just wait on the network."""
+    calls = {}
+    if "fb" in args.only:
+        calls["facebook"] = asyncio.to_thread(_fb_worker, args, handles, screenshot_dir)
+    if "yt" in args.only:
+        calls["youtube"] = asyncio.to_thread(_yt_worker, args, handles, screenshot_dir)
+
+    # return_exceptions: one worker crashing must not lose the other's result
+    done = await asyncio.gather(*calls.values(), return_exceptions=True)
+    return dict(zip(calls, done))
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -60,7 +115,7 @@ def main():
     print("\n" + "─" * 55)
     print("HANDLES GENERATED")
     print("─" * 55)
-    print(json.dumps(handles.as_dict(), ensure_ascii=False, indent=2))
+    print(_pretty(handles.as_dict()))
 
     if args.dry_run or "naming" in args.only:
         print("\n[dry-run] Stopping here — no accounts created.")
@@ -74,23 +129,18 @@ def main():
 
     results = {}
 
-    # ── Step 3: Create FB page ───────────────────────────────────────────────
-    if "fb" in args.only:
+    # ── Step 3+4: Create FB page + YT channel (concurrently) ─────────────────
+    if "fb" in args.only or "yt" in args.only:
         print("\n" + "─" * 55)
-        print("CREATING FACEBOOK PAGE")
+        print("CREATING FACEBOOK PAGE + YOUTUBE CHANNEL")
         print("─" * 55)
-        from workers.facebook_worker import create_facebook_page
-        from config.settings import FB_CATEGORY
-
-        fb = create_facebook_page(
-            page_name     = handles.fb_page_name,
-            category      = FB_CATEGORY,
-            cdp_url       = args.cdp_url,
-            screenshot_dir= f"/tmp/stage_job_{job_id}",
-        )
-        os.makedirs(f"/tmp/stage_job_{job_id}", exist_ok=True)
-        results["facebook"] = fb
+        results.update(asyncio.run(_create_fb_yt(args, handles, _job_dir(job_id))))
 
+    fb = results.get("facebook")
+    if isinstance(fb, Exception):
+        db.fail_fb(job_id, str(fb))
+        print(f"  ✗ FB Page FAILED: {fb}")
+    elif fb is not None:
         if fb.success:
             db.update_fb(job_id, fb.page_id or "", fb.page_url or "", fb.page_name or "")
             print(f"  ✓ FB Page created: {fb.page_url}")
@@ -98,20 +148,11 @@ def main():
             db.fail_fb(job_id, fb.error or "Unknown")
             print(f"  ✗ FB Page FAILED: {fb.error}")
 
-    # ── Step 4: Create YT channel ────────────────────────────────────────────
-    if "yt" in args.only:
-        print("\n" + "─" * 55)
-        print("CREATING YOUTUBE CHANNEL")
-        print("─" * 55)
-        from workers.youtube_worker import create_youtube_channel
-
-        yt = create_youtube_channel(
-            channel_name  = handles.yt_channel_name,
-            cdp_url       = args.cdp_url,
-            screenshot_dir= f"/tmp/stage_job_{job_id}",
-        )
-        results["youtube"] = yt
-
+    yt = results.get("youtube")
+    if isinstance(yt, Exception):
+        db.fail_yt(job_id, str(yt))
+        print(f"  ✗ YT Channel FAILED: {yt}")
+    elif yt is not None:
         if yt.success:
             db.update_yt(job_id, yt.channel_id or "", yt.channel_url or "",
                          yt.channel_name or "", yt.handle)
@@ -152,7 +193,7 @@ def main():
     print("FINAL STATUS")
     print("─" * 55)
     summary = db.summary(job_id)
-    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    print(_pretty(summary))
     print(f"\nJob ID: {job_id} — check anytime with:")
     print(f"  python scripts/create_profiles.py --status {job_id}")
 
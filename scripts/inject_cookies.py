@@ -8,7 +8,10 @@ Usage:
     python scripts/inject_cookies.py
 """
 
+import importlib.util
 import sys, time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from typing import Optional
 
 CDP_URL = "http://localhost:9222"
@@ -16,44 +19,91 @@ CDP_URL = "http://localhost:9222"
 try:
     import browser_cookie3
 except ImportError:
-    print("Installing browser-cookie3...")
-    import subprocess
-    subprocess.run([sys.executable, "-m", "pip", "install", "browser-cookie3"], check=True)
-    import browser_cookie3
+    sys.exit("❌ browser-cookie3 not installed — run: pip install -r requirements.txt")
 
-try:
+# patchright (stealth fork) if installed, else stock playwright — resolved once
+if importlib.util.find_spec("patchright") is not None:
     from patchright.sync_api import sync_playwright
-except ImportError:
+else:
     from playwright.sync_api import sync_playwright
 
 import requests
+from requests.adapters import HTTPAdapter
+
+# One keep-alive session for every CDP HTTP call (/json/new, /json, /json/version)
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
 
 
 def open_cdp_tab(cdp_url: str, target_url: str) -> Optional[str]:
     try:
-        resp = requests.put(f"{cdp_url}/json/new?{target_url}", timeout=10)
+        resp = SESSION.put(f"{cdp_url}/json/new?{target_url}", timeout=10)
         return resp.json().get("id")
     except Exception as e:
         print(f"  Warning: could not open tab: {e}")
         return None
 
 
+def page_tab_urls(cdp_url: str) -> list[str]:
+    """URLs of the page targets currently open in Chrome ([] if /json fails)."""
+    try:
+        targets = SESSION.get(f"{cdp_url}/json", timeout=5).json()
+    except Exception:
+        return []
+    return [t.get("url", "") for t in targets if t.get("type") == "page"]
+
+
+def wait_for_tabs(cdp_url: str, hosts: tuple[str, ...],
+                  timeout: float = 8.0, interval: float = 0.25) -> list[str]:
+    """Poll /json until every host has a page target (or timeout). Returns page URLs."""
+    deadline  = time.time() + timeout
+    page_urls = []
+    while True:
+        page_urls = page_tab_urls(cdp_url)
+        if all(any(h in u for u in page_urls) for h in hosts):
+            return page_urls
+        if time.time() >= deadline:
+            return page_urls
+        time.sleep(interval)
+
+
 def cookie_to_pw(c):
-    domain = c.domain or ""
-    if domain and not domain.startswith("."):
-        domain = "." + domain
-    name  = str(c.name  or "")
-    value = str(c.value or "")
+    """http.cookiejar.Cookie → Playwright cookie dict (None if nameless)."""
+    name = c.name
     if not name:
         return None
-    d = {"name": name, "value": value, "domain": domain, "path": c.path or "/"}
-    if c.expires and c.expires > 0:
-        d["expires"] = float(c.expires)
+    domain = c.domain or ""
+    if domain and domain[0] != ".":
+        domain = "." + domain
+    d = {"name": str(name), "value": str(c.value or ""), "domain": domain, "path": c.path or "/"}
+    exp = c.expires
+    if exp and exp > 0:
+        d["expires"] = float(exp)
     if c.secure:
         d["secure"] = True
     return d
 
 
+def add_cookies_batched(ctx, cookies: list[dict]) -> tuple[int, int]:
+    """
+    One add_cookies call for the whole list. If Chrome rejects the batch,
+    split in halves until the bad cookies are isolated (instead of one CDP
+    round-trip per cookie). Returns (ok, fail).
+    """
+    if not cookies:
+        return 0, 0
+    try:
+        ctx.add_cookies(cookies)
+        return len(cookies), 0
+    except Exception:
+        if len(cookies) == 1:
+            return 0, 1
+    mid = len(cookies) // 2
+    ok1, fail1 = add_cookies_batched(ctx, cookies[:mid])
+    ok2, fail2 = add_cookies_batched(ctx, cookies[mid:])
+    return ok1 + ok2, fail1 + fail2
+
+
 def main():
     print("=" * 55)
     print("  STAGE Cookie Injector")
@@ -61,7 +111,7 @@ def main():
 
     # Check Chrome is running
     try:
-        r = requests.get(f"{CDP_URL}/json/version", timeout=3)
+        r = SESSION.get(f"{CDP_URL}/json/version", timeout=3)
         print(f"\n✅ Chrome found: {r.json().get('Browser','?')}")
     except Exception:
         print(f"\n❌ Chrome not running at {CDP_URL}")
@@ -71,36 +121,42 @@ def main():
     # ── Step 1: Open FB + YT tabs BEFORE starting Patchright session ──────────
     # CRITICAL: Tabs opened via CDP HTTP API are only visible in context.pages
     # if they were opened BEFORE the Patchright session connects.
+    # Only open what's missing — re-running the injector must not stack duplicate tabs.
     print("\nOpening FB + YT tabs (before Patchright session)...")
-    open_cdp_tab(CDP_URL, "https://www.facebook.com/")
-    open_cdp_tab(CDP_URL, "https://www.youtube.com/")
-    print("   Waiting for pages to initialize (8s)...")
-    time.sleep(8)
-
-    # Verify tabs appeared in CDP
-    try:
-        targets = requests.get(f"{CDP_URL}/json", timeout=5).json()
-        page_urls = [t.get("url","") for t in targets if t.get("type") == "page"]
-        print(f"   Chrome page tabs: {len(page_urls)}")
-        for u in page_urls:
-            print(f"     {u[:70]}")
-    except Exception:
-        pass
+    open_urls = page_tab_urls(CDP_URL)
+    missing   = [url for host, url in (("facebook.com", "https://www.facebook.com/"),
+                                       ("youtube.com",  "https://www.youtube.com/"))
+                 if not any(host in u for u in open_urls)]
+    if missing:
+        with ThreadPoolExecutor(max_workers=len(missing)) as pool:
+            list(pool.map(lambda url: open_cdp_tab(CDP_URL, url), missing))
+    else:
+        print("   FB + YT tabs already open — reusing them")
+    print("   Waiting for pages to initialize (up to 8s)...")
+    page_urls = wait_for_tabs(CDP_URL, ("facebook.com", "youtube.com"))
+
+    print(f"   Chrome page tabs: {len(page_urls)}")
+    for u in page_urls:
+        print(f"     {u[:70]}")
 
     # ── Step 2: Extract cookies from regular Chrome ────────────────────────────
     print("\nExtracting cookies from your regular Chrome...")
     try:
-        fb_raw = list(browser_cookie3.chrome(domain_name=".facebook.com"))
-        g_raw  = list(browser_cookie3.chrome(domain_name=".google.com"))
-        yt_raw = list(browser_cookie3.chrome(domain_name=".youtube.com"))
+        # CookieJars straight from browser_cookie3 — no list() copies
+        fb_jar = browser_cookie3.chrome(domain_name=".facebook.com")
+        g_jar  = browser_cookie3.chrome(domain_name=".google.com")
+        yt_jar = browser_cookie3.chrome(domain_name=".youtube.com")
     except Exception as e:
         print(f"❌ Cookie extraction failed: {e}")
         print("   Make sure regular Chrome is open with FB + Google logged in")
         sys.exit(1)
 
-    all_raw = fb_raw + g_raw + yt_raw
-    all_pw  = [c for c in (cookie_to_pw(r) for r in all_raw) if c is not None]
-    print(f"   Found {len(all_pw)} cookies (FB:{len(fb_raw)} G:{len(g_raw)} YT:{len(yt_raw)})")
+    # Single streaming pass: convert, drop invalid, and dedupe by (name, domain, path)
+    all_pw = list({
+        (c["name"], c["domain"], c["path"]): c
+        for c in map(cookie_to_pw, chain(fb_jar, g_jar, yt_jar)) if c is not None
+    }.values())
+    print(f"   Found {len(all_pw)} cookies (FB:{len(fb_jar)} G:{len(g_jar)} YT:{len(yt_jar)})")
 
     # ── Step 3: Connect Patchright and inject cookies ──────────────────────────
     # IMPORTANT: Use manual start/stop (not "with" context manager) so Playwright
@@ -115,13 +171,7 @@ def main():
         for pg in ctx.pages:
             print(f"     {pg.url[:70]}")
 
-        ok = fail = 0
-        for cookie in all_pw:
-            try:
-                ctx.add_cookies([cookie])
-                ok += 1
-            except Exception:
-                fail += 1
+        ok, fail = add_cookies_batched(ctx, all_pw)
         print(f"   Injected: {ok} ✅  |  Skipped: {fail}")
 
         # ── Step 4: Reload FB + YT to apply cookies ────────────────────────────
@@ -133,23 +183,25 @@ def main():
             elif "youtube.com" in pg.url:
                 yt_page = pg
 
-        if fb_page:
+        # Both reloads are started first (wait_until="commit" returns as soon as
+        # the navigation is committed) so the two page loads overlap in Chrome;
+        # then wait for each DOM. The sync API is single-threaded, so no threads.
+        reloading = []
+        for label, pg in (("FB", fb_page), ("YT", yt_page)):
+            if not pg:
+                continue
             try:
-                fb_page.reload(wait_until="domcontentloaded", timeout=20000)
-                time.sleep(2)
-                print(f"   FB reloaded: {fb_page.url[:70]}")
+                pg.reload(wait_until="commit", timeout=20000)
+                reloading.append((label, pg))
             except Exception as e:
-                print(f"   FB reload error: {e}")
+                print(f"   {label} reload error: {e}")
 
-        if yt_page:
+        for label, pg in reloading:
             try:
-                yt_page.reload(wait_until="domcontentloaded", timeout=20000)
-                time.sleep(2)
-                print(f"   YT reloaded: {yt_page.url[:70]}")
+                pg.wait_for_load_state("domcontentloaded", timeout=20000)
+                print(f"   {label} reloaded: {pg.url[:70]}")
             except Exception as e:
-                print(f"   YT reload error: {e}")
-
-        time.sleep(3)
+                print(f"   {label} reload error: {e}")
 
         # ── Step 5: Verify sessions ────────────────────────────────────────────
         print("\nVerifying sessions...")
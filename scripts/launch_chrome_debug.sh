@@ -37,7 +37,19 @@ if [[ "$OSTYPE" == "darwin"* ]]; then
 
 # Linux
 elif [[ "$OSTYPE" == "linux-gnu"* ]]; then
-    google-chrome \
+    # Bare names are resolved via $PATH (first hit wins)
+    CHROME=""
+    for candidate in google-chrome google-chrome-stable chromium chromium-browser; do
+        if CHROME="$(command -v "$candidate")"; then
+            break
+        fi
+    done
+    if [ -z "$CHROME" ]; then
+        echo "ERROR: Chrome/Chromium not found on PATH"
+        echo "Install Chrome from: https://chrome.google.com"
+        exit 1
+    fi
+    "$CHROME" \
         --remote-debugging-port=$DEBUG_PORT \
         --user-data-dir="$PROFILE_DIR" \
         --no-first-run \
@@ -46,6 +58,18 @@ elif [[ "$OSTYPE" == "linux-gnu"* ]]; then
 fi
 
 echo "Chrome launched (PID: $!)"
-echo "CDP available at: http://localhost:$DEBUG_PORT"
-echo ""
-echo "Verify with: curl http://localhost:$DEBUG_PORT/json/version"
+
+# Poll /json/version until CDP answers (max 10s wall clock) instead of guessing a sleep
+CDP_WAIT_S=10
+SECONDS=0
+while (( SECONDS < CDP_WAIT_S )); do
+    if curl -sf --max-time 0.25 "http://localhost:$DEBUG_PORT/json/version" >/dev/null; then
+        echo "CDP available at: http://localhost:$DEBUG_PORT (ready after ${SECONDS}s)"
+        exit 0
+    fi
+    sleep 0.1
+done
+
+echo "ERROR: CDP did not come up on port $DEBUG_PORT within ${CDP_WAIT_S}s"
+echo "Check with: curl http://localhost:$DEBUG_PORT/json/version"
+exit 1
@@ -20,23 +20,28 @@ except ImportError:
     from playwright.sync_api import sync_playwright
 
 
+# Login probes run in the page as one evaluate round-trip each
+_FB_LOGGED_IN_JS = """() =>
+    !document.querySelector('input[name="email"], input[data-testid="royal_email"]')
+"""
+_GOOGLE_LOGGED_IN_JS = """() =>
+    !(location.href.includes('accounts.google.com') && location.href.includes('signin')) &&
+    !document.querySelector('a[href*="accounts.google.com/ServiceLogin"]')
+"""
+
+
 def check_fb_logged_in(page) -> bool:
     try:
         # Logged in = no login form visible
-        login_form = page.locator('input[name="email"], input[data-testid="royal_email"]').count()
-        return login_form == 0
+        return bool(page.evaluate(_FB_LOGGED_IN_JS))
     except Exception:
         return False
 
 
 def check_google_logged_in(page) -> bool:
     try:
-        url = page.url
-        if "accounts.google.com" in url and "signin" in url:
-            return False
-        # Check for user avatar on YT
-        signin_btn = page.locator('a[href*="accounts.google.com/ServiceLogin"]').count()
-        return signin_btn == 0
+        # Not on the sign-in page and no "Sign in" link on YT
+        return bool(page.evaluate(_GOOGLE_LOGGED_IN_JS))
     except Exception:
         return False
 
@@ -44,20 +49,28 @@ def check_google_logged_in(page) -> bool:
 def wait_for_login(page, platform: str, check_fn, timeout_sec=300) -> bool:
     print(f"\n⏳ Waiting for {platform} login (you have {timeout_sec//60} minutes)...")
     print(f"   👉 Type your credentials in the Chrome window now")
-    start = time.time()
-    dots = 0
-    while time.time() - start < timeout_sec:
+    deadline = time.time() + timeout_sec
+    # No reload polling — a login submit always navigates the tab, so check once
+    # up front, then sleep until the main frame navigates and re-check.
+    while True:
+        if check_fn(page):
+            print(f"\n✅ {platform} login detected!")
+            return True
+        remaining = deadline - time.time()
+        if remaining <= 0 or page.is_closed():
+            break
+        try:
+            page.wait_for_event(
+                "framenavigated",
+                predicate=lambda frame: frame == page.main_frame,
+                timeout=remaining * 1000,
+            )
+        except Exception:
+            continue   # deadline hit (or transient error) — loop re-checks and exits on time
         try:
-            page.reload(wait_until="domcontentloaded", timeout=15000)
-            time.sleep(2)
-            if check_fn(page):
-                print(f"\n✅ {platform} login detected!")
-                return True
+            page.wait_for_load_state("domcontentloaded", timeout=15000)
         except Exception:
-            pass
-        dots += 1
-        print("." * (dots % 4 + 1), end="\r", flush=True)
-        time.sleep(3)
+            pass       # slow page — still worth a login check
     print(f"\n❌ Timeout waiting for {platform} login")
     return False
 
@@ -13,8 +13,10 @@ Agar CAPTCHA/checkpoint aaye:
 Run: python setup/setup_fb_worker.py
 """
 from __future__ import annotations
-import asyncio, json, os, sys
+import asyncio, os, re, sys
 from pathlib import Path
+
+import orjson
 from dotenv import load_dotenv
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -24,6 +26,10 @@ FB_EMAIL    = os.getenv("FB_WORKER_EMAIL", "")
 FB_PASSWORD = os.getenv("FB_WORKER_PASSWORD", "")
 COOKIES_OUT = Path(__file__).parent.parent / "config" / "fb_cookies.json"
 
+# wait_for_url matchers — module level, ek regex pass per URL-change event (lambda closures nahi)
+_LOGIN_SETTLED_RE = re.compile(r"checkpoint|^(?!.*(?:login|accounts))")   # checkpoint ya logged in
+_LOGGED_IN_RE     = re.compile(r"^(?!.*(?:checkpoint|login|accounts))")
+
 
 async def setup_fb_worker():
     if not FB_EMAIL or not FB_PASSWORD:
@@ -39,87 +45,100 @@ async def setup_fb_worker():
         page = await browser.new_page()
 
         # ── FB login page ────────────────────────────────────────────────────
-        await page.goto("https://www.facebook.com", wait_until="networkidle", timeout=30000)
-        await asyncio.sleep(2)
+        await page.goto("https://www.facebook.com", wait_until="domcontentloaded", timeout=30000)
+        # Login form ya logged-in top bar — jo pehle aaye (networkidle FB pe kabhi nahi aata)
+        try:
+            await page.wait_for_selector(
+                '#email, input[name="email"], [role="banner"]', timeout=15000
+            )
+        except Exception:
+            pass
 
         # Already logged in? (profile se purana session)
-        if "login" not in page.url and "accounts" not in page.url:
-            cookies = await page.context.cookies()
-            fb_cookies = [c for c in cookies if "facebook.com" in c.get("domain", "")]
-            if any(c["name"] == "c_user" for c in fb_cookies):
-                _save_cookies(fb_cookies)
+        url = page.url
+        if "login" not in url and "accounts" not in url:
+            state = await _fb_storage_state(page.context)
+            if any(c["name"] == "c_user" for c in state["cookies"]):
+                _save_cookies(state)
                 print("✅ Already logged in — cookies saved!")
                 return
 
         # ── Fill login form ──────────────────────────────────────────────────
         print("[SETUP] Filling login form...")
 
-        # Email field — multiple selector fallbacks
-        for sel in ['#email', 'input[name="email"]', 'input[type="email"]']:
-            try:
-                await page.wait_for_selector(sel, timeout=5000)
-                await page.fill(sel, FB_EMAIL)
-                break
-            except:
-                continue
-
-        await asyncio.sleep(0.8)
-
-        # Password field
-        for sel in ['#pass', 'input[name="pass"]', 'input[type="password"]']:
-            try:
-                await page.fill(sel, FB_PASSWORD)
-                break
-            except:
-                continue
-
-        await asyncio.sleep(1.2)
-
-        # Submit
-        for sel in ['button[name="login"]', 'input[value="Log In"]', '[data-testid="royal_login_button"]', 'button[type="submit"]']:
-            try:
-                await page.click(sel, timeout=3000)
-                break
-            except:
-                continue
+        # Email field — multiple selector fallbacks, ek hi comma-joined wait mein
+        try:
+            await page.fill('#email, input[name="email"], input[type="email"]', FB_EMAIL, timeout=5000)
+        except Exception:
+            pass
+
+        # Password field — fill() khud visible hone tak wait karta hai
+        try:
+            await page.fill('#pass, input[name="pass"], input[type="password"]', FB_PASSWORD, timeout=5000)
+        except Exception:
+            pass
+
+        # Submit — navigation start hone tak ruko, warna purana URL hi match ho jayega
+        try:
+            async with page.expect_navigation(wait_until="commit", timeout=30000):
+                await page.click(
+                    'button[name="login"], input[value="Log In"], '
+                    '[data-testid="royal_login_button"], button[type="submit"]',
+                    timeout=3000,
+                )
+        except Exception:
+            pass
 
         print("[SETUP] Login submit kiya — wait kar raha hoon...")
 
-        # ── Wait for successful login OR checkpoint ──────────────────────────
-        await asyncio.sleep(5)
-
-        for _ in range(24):  # Max 2 minutes wait
-            url = page.url
-            if "checkpoint" in url:
-                print(f"\n⚠️  Checkpoint detected: {url}")
-                print("Browser window mein checkpoint handle karo...")
-                print("Handle karne ke baad yahan Enter dabao.")
-                await asyncio.get_event_loop().run_in_executor(None, input, ">>> Enter dabao: ")
-            elif "login" not in url and "accounts" not in url:
-                break  # Logged in
-            await asyncio.sleep(5)
+        # ── Wait for successful login OR checkpoint (max 2 min) ─────────────
+        try:
+            await page.wait_for_url(_LOGIN_SETTLED_RE, timeout=120_000)
+        except Exception:
+            pass
+
+        url = page.url
+        if "checkpoint" in url:
+            print(f"\n⚠️  Checkpoint detected: {url}")
+            print("Browser window mein checkpoint handle karo...")
+            print("Handle karne ke baad yahan Enter dabao.")
+            await asyncio.get_event_loop().run_in_executor(None, input, ">>> Enter dabao: ")
+            try:
+                await page.wait_for_url(_LOGGED_IN_RE, timeout=120_000)
+            except Exception:
+                pass
 
         # ── Verify + save cookies ────────────────────────────────────────────
-        cookies = await page.context.cookies()
-        fb_cookies = [c for c in cookies if "facebook.com" in c.get("domain", "")]
-        c_user = next((c for c in fb_cookies if c["name"] == "c_user"), None)
+        state = await _fb_storage_state(page.context)
+        c_user = next((c for c in state["cookies"] if c["name"] == "c_user"), None)
 
         if not c_user:
             print(f"\n❌ Login nahi hua. Current URL: {page.url}")
             print("Email/password check karo ya manually browser mein login karo.")
             sys.exit(1)
 
-        _save_cookies(fb_cookies)
+        _save_cookies(state)
         print(f"\n✅ Login successful!")
         print(f"   FB User ID: {c_user['value']}")
         print(f"   Cookies saved: {COOKIES_OUT}")
         print(f"   Ab kabhi login nahi karna padega.\n")
 
 
-def _save_cookies(cookies: list):
+async def _fb_storage_state(context) -> dict:
+    """
+    Playwright storage_state (cookies + localStorage), sirf facebook.com ka.
+    Worker isse seedha new_context(storage_state=...) mein deta hai — ek call, N add_cookies nahi.
+    """
+    state = await context.storage_state()
+    state["cookies"] = [c for c in state["cookies"] if "facebook.com" in c.get("domain", "")]
+    state["origins"] = [o for o in state.get("origins", []) if "facebook.com" in o.get("origin", "")]
+    return state
+
+
+def _save_cookies(state: dict):
     COOKIES_OUT.parent.mkdir(exist_ok=True)
-    with open(COOKIES_OUT, "w") as f:
-        json.dump(cookies, f, indent=2)
+    # Compact — worker ise har naye mtime pe padhta hai, indent sirf size badhata hai
+    COOKIES_OUT.write_bytes(orjson.dumps(state))
 
 
 if __name__ == "__main__":
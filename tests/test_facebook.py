@@ -16,7 +16,8 @@ async def test_1_cookies_exist():
     from config.settings import FB_COOKIES_FILE
     assert Path(FB_COOKIES_FILE).exists(), \
         f"FAIL: {FB_COOKIES_FILE} nahi mili\nRun: python setup/setup_fb_worker.py"
-    cookies = json.loads(Path(FB_COOKIES_FILE).read_text())
+    state = json.loads(Path(FB_COOKIES_FILE).read_text())
+    cookies = state["cookies"] if isinstance(state, dict) else state   # storage_state ya purani list
     assert any(c["name"] == "c_user" for c in cookies), \
         "FAIL: c_user cookie nahi — session invalid"
     c_user = next(c for c in cookies if c["name"] == "c_user")
@@ -37,14 +38,19 @@ async def test_2_camoufox_loads():
 async def test_3_fb_session_valid():
     print("\n[T3] FB session check...")
     from camoufox.async_api import AsyncCamoufox
-    from config.settings import FB_COOKIES_FILE
-    cookies = json.loads(Path(FB_COOKIES_FILE).read_text())
+    from config.settings import FB_COOKIES_FILE, FB_WORKER_GEOIP
+    state = json.loads(Path(FB_COOKIES_FILE).read_text())
+    cookies = state["cookies"] if isinstance(state, dict) else state
 
-    async with AsyncCamoufox(headless=True, geoip=True) as browser:
+    async with AsyncCamoufox(headless=True, geoip=FB_WORKER_GEOIP) as browser:
         page = await browser.new_page()
         await browser.add_cookies(cookies)
-        await page.goto("https://www.facebook.com", wait_until="networkidle", timeout=30000)
-        await asyncio.sleep(2)
+        # networkidle FB pe kabhi nahi aata — DOM ready + login form / top bar ka wait
+        await page.goto("https://www.facebook.com", wait_until="domcontentloaded", timeout=30000)
+        try:
+            await page.wait_for_selector('#email, input[name="email"], [role="banner"]', timeout=15000)
+        except Exception:
+            pass
 
         assert "login" not in page.url, \
             f"FAIL: FB login page — session expired\nURL: {page.url}\nRun: python setup/setup_fb_worker.py"
@@ -78,25 +84,33 @@ async def test_5_db_record():
         session.close()
 
 
+async def _run(t) -> bool:
+    try:
+        await t()
+        return True
+    except AssertionError as e:
+        print(f"  ❌ {e}")
+    except Exception as e:
+        print(f"  ❌ {type(e).__name__}: {e}")
+    return False
+
+
 async def run_all():
     print("=" * 55)
     print("  STAGE Social Creator — Facebook Tests (Camoufox)")
     print("=" * 55)
 
-    tests = [test_1_cookies_exist, test_2_camoufox_loads,
-             test_3_fb_session_valid, test_4_create_fb_page, test_5_db_record]
-    passed = failed = 0
-
-    for t in tests:
-        try:
-            await t()
-            passed += 1
-        except AssertionError as e:
-            print(f"  ❌ {e}")
-            failed += 1
-        except Exception as e:
-            print(f"  ❌ {type(e).__name__}: {e}")
-            failed += 1
+    # T2 aur T3 dono browser launch karte hain aur ek doosre pe depend nahi — saath chalao.
+    # T4 ko valid session chahiye, T5 ko T4 ka record — wo order mein.
+    stages = [[test_1_cookies_exist],
+              [test_2_camoufox_loads, test_3_fb_session_valid],
+              [test_4_create_fb_page],
+              [test_5_db_record]]
+    results = []
+    for stage in stages:
+        results += await asyncio.gather(*(_run(t) for t in stage))
+    passed = sum(results)
+    failed = len(results) - passed
 
     print(f"\n{'='*55}")
     print(f"  {passed} passed  |  {failed} failed")
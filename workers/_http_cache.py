@@ -0,0 +1,60 @@
+"""
+workers/_http_cache.py — Small cross-process TTL cache for slow-changing provider listings
+
+Things like SMS-Man's /applications list change only when the provider adds a platform.
+Results are kept in one sqlite file, so the first worker process pays the HTTP call
+and the others read it from disk until the TTL runs out.
+"""
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+import time
+from contextlib import closing
+from functools import wraps
+
+import orjson
+
+_DEFAULT_PATH = os.path.join(tempfile.gettempdir(), "stage_http_cache.sqlite")
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    db = sqlite3.connect(path, timeout=5)
+    db.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, expires REAL)")
+    return db
+
+
+def cached(ttl: float, path: str = _DEFAULT_PATH):
+    """
+    Memoize a function's JSON-serializable result on disk for ttl seconds.
+
+    Positional args are hashed into the key, so API keys are never stored in clear.
+    Exceptions propagate and are not cached. An unreadable cache file just means a
+    live call.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args):
+            key = hashlib.sha256(orjson.dumps([fn.__module__, fn.__qualname__, *args])).hexdigest()
+            now = time.time()
+            try:
+                with closing(_connect(path)) as db:
+                    row = db.execute("SELECT value, expires FROM cache WHERE key = ?", (key,)).fetchone()
+                if row and row[1] > now:
+                    return orjson.loads(row[0])
+            except sqlite3.Error:
+                pass
+
+            value = fn(*args)
+            try:
+                with closing(_connect(path)) as db, db:
+                    db.execute(
+                        "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+                        (key, orjson.dumps(value), now + ttl),
+                    )
+            except sqlite3.Error:
+                pass
+            return value
+        return wrapper
+    return decorator
@@ -4,7 +4,7 @@ Facebook Page Creation Worker — Camoufox (Firefox stealth)
 Chrome CDP se koi lena dena nahi. Zero tab-closing issues.
 
 Flow per title:
-  1. fb_cookies.json load karo → Camoufox context mein inject
+  1. fb_cookies.json (storage_state) load karo → naya Camoufox context usi se banao
   2. facebook.com/pages/create navigate karo (already logged in)
   3. page.route() → GraphQL intercept → category_ids inject (field_exception fix)
   4. Page name + category fill → submit
@@ -16,200 +16,375 @@ Requirements:
 """
 from __future__ import annotations
 
-import asyncio, json, os, re, sys, urllib.parse, requests
+import asyncio, os, re, sys, threading, time, urllib.parse, requests
+from contextlib import asynccontextmanager
 from pathlib import Path
-from datetime import datetime, timezone
+
+import orjson
+from requests.adapters import HTTPAdapter
+from sqlalchemy import insert
+from urllib3.util.retry import Retry
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from config.settings import FB_COOKIES_FILE, META_SYSTEM_USER_TOKEN
-from db.models import get_session, TitleProfile, TokenVault, EventLog
+from config.settings import FB_COOKIES_FILE, FB_WORKER_GEOIP, META_SYSTEM_USER_TOKEN
+from db.models import get_session, upsert_title, AuditBuffer, TokenVault
 
 FB_CATEGORY_ENTERTAINMENT = 2200  # Valid FB category ID
 
-
-def _load_cookies() -> list[dict]:
-    if not Path(FB_COOKIES_FILE).exists():
+# Context-wide defaults — har call pe 30000/15000 likhne ki jagah ek predictable hang-floor.
+# Optional/fallback elements (category, button) apne chhote timeouts rakhte hain.
+ACTION_TIMEOUT_MS     = 15_000
+NAVIGATION_TIMEOUT_MS = 20_000
+
+# ── Selector waterfalls ─────────────────────────────────────────────────────
+_NAME_SELECTORS = [
+    'input[name="name"]',
+    'input[placeholder*="name" i]',
+    'input[aria-label*="Page name" i]',
+    'input[aria-label*="name" i]',
+]
+_CATEGORY_SELECTORS = [
+    'input[placeholder*="categor" i]',
+    'input[aria-label*="categor" i]',
+]
+_CATEGORY_OPTION_SELECTORS = [
+    '[role="option"]:first-child',
+    '[role="listbox"] li:first-child',
+]
+_CREATE_BUTTON_SELECTORS = [
+    'button[type="submit"]',
+    'div[role="button"]:has-text("Create Page")',
+    'div[aria-label*="Create Page" i]',
+    'button:has-text("Create Page")',
+]
+# Import pe ek baar comma-join — Playwright saare candidates ek hi query mein race karta hai
+_NAME_SEL            = ", ".join(_NAME_SELECTORS)
+_CATEGORY_SEL        = ", ".join(_CATEGORY_SELECTORS)
+_CATEGORY_OPTION_SEL = ", ".join(_CATEGORY_OPTION_SELECTORS)
+_CREATE_BUTTON_SEL   = ", ".join(_CREATE_BUTTON_SELECTORS)
+
+# Graph API ke liye ek keep-alive session — har token fetch pe naya TLS handshake nahi
+_HTTP = requests.Session()
+_HTTP.headers.update({"User-Agent": "stage-social-creator/1.0"})
+# Graph API ke transient 429/5xx pe chhota backoff retry — usi pooled connection pe
+_HTTP.mount("https://", HTTPAdapter(
+    pool_connections=10, pool_maxsize=10,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504]),
+))
+
+# Page ban gaya → /<id> (create ke bina) ya /<slug>/about|settings|... pe redirect
+_PAGE_READY_RE = re.compile(
+    r"facebook\.com/(?:\d{5,}(?!.*create)|[^/]+/(about|settings|dashboard|posts|manage))"
+)
+# Page ID ke saare URL shapes ek alternation mein — /<id>, ?id=, profile.php?id=,
+# /pages/<name>/<id>, /people/<name>/<id>, /p/<name>-<id>
+_PAGE_ID_RE = re.compile(
+    r"(?:facebook\.com/|[?&]id=|/pages/[^/]+/|/people/[^/]+/|/p/[^/?]*-)(?P<id>\d{8,})"
+)
+# URL se id na mile to DOM fallback — V8 mein match, Python ko sirf id string
+_PAGE_ID_FROM_DOM_JS = r"""() => {
+    const m = document.documentElement.outerHTML.match(/"(?:page_id|pageID)":"?(\d{8,})"?/);
+    return m ? m[1] : null;
+}"""
+# Page-creation mutation ke response mein naye page ka id
+_GRAPHQL_PAGE_ID_RE = re.compile(
+    rb'"(?:page_id|pageID|delegate_page_id)":"?(\d{8,})|"page":\{"id":"(\d{8,})"'
+)
+# Sirf FB ka GraphQL endpoint (/api/graphql/) — "**/*graphql*" har graphql-wale URL pe handler chalata tha
+_GRAPHQL_ROUTE = "**/api/graphql/*"
+# Page-creation mutation ka marker — raw bytes pe ek scan, decode/body.lower() ki copy nahi
+_VARIABLES_RE = re.compile(rb"(?:^|&)variables=([^&]*)")
+_CREATE_MUTATION_RE = re.compile(rb"additional_profile_plus_create|PageCreationMutation|(?i:create_page)")
+
+
+# (mtime, storage_state) — setup dobara chale to mtime badlega aur file phir se padhi jayegi
+_COOKIES_CACHE: tuple[float, dict] | None = None
+
+
+def _load_cookies() -> dict:
+    """
+    fb_cookies.json → Playwright storage_state dict ({"cookies": [...], "origins": [...]}).
+    Purani setup sirf cookies ki list likhti thi — wo bhi chalegi, wrap kar dete hain.
+    """
+    global _COOKIES_CACHE
+    try:
+        mtime = Path(FB_COOKIES_FILE).stat().st_mtime
+    except FileNotFoundError:
         raise FileNotFoundError(
             f"Cookies nahi mili: {FB_COOKIES_FILE}\n"
             "Run: python setup/setup_fb_worker.py"
-        )
-    return json.loads(Path(FB_COOKIES_FILE).read_text())
+        ) from None
+    if _COOKIES_CACHE is None or _COOKIES_CACHE[0] != mtime:
+        state = orjson.loads(Path(FB_COOKIES_FILE).read_bytes())
+        if isinstance(state, list):
+            state = {"cookies": state, "origins": []}
+        _COOKIES_CACHE = (mtime, state)
+    return _COOKIES_CACHE[1]
 
 
-async def create_fb_page(title_name: str, title_id: str) -> dict:
+@asynccontextmanager
+async def fb_browser():
     """
-    FB Page banao STAGE title ke liye.
-    Returns: {"page_id": ..., "page_url": ..., "page_token": ...}
+    Ek Camoufox browser launch karo aur poore batch ke liye reuse karo.
+    Har create_fb_page call sirf naya context kholta hai — launch cost ek hi baar.
     """
     from camoufox.async_api import AsyncCamoufox
+    async with AsyncCamoufox(headless=True, geoip=FB_WORKER_GEOIP) as browser:
+        yield browser
+
 
-    cookies = _load_cookies()
+async def create_fb_page(title_name: str, title_id: str, browser=None,
+                         save: bool = True) -> dict:
+    """
+    FB Page banao STAGE title ke liye.
+    browser: fb_browser() se mila shared browser — None = sirf is call ke liye launch.
+    save: False = DB write caller karega (batch ek saath save_batch_to_db karta hai).
+    Returns: {"page_id": ..., "page_url": ..., "page_token": ...}
+    """
+    # Cookie file thread mein padho (event loop block na ho) — own browser launch ke saath overlap
+    state_task = asyncio.ensure_future(asyncio.to_thread(_load_cookies))
     print(f"\n[FB] '{title_name}' ke liye page bana raha hoon...")
 
-    async with AsyncCamoufox(headless=True, geoip=True) as browser:
-        context = browser
-        page = await context.new_page()
+    try:
+        if browser is None:
+            async with fb_browser() as own_browser:
+                result = await _create_in_browser(own_browser, title_name, await state_task)
+        else:
+            result = await _create_in_browser(browser, title_name, await state_task)
+    finally:
+        state_task.cancel()   # launch fail hua to pending/unretrieved task na chhoote
 
-        # ── 1. Cookies inject karo → login bypass ───────────────────────────
-        await context.add_cookies(cookies)
-        print("[FB] Cookies injected ✓")
+    # ── 10. DB mein save karo (browser context band hone ke baad) ───────────
+    if save:
+        await asyncio.to_thread(_save_to_db, title_id, title_name, result)
+
+    print(f"[FB] ✅ Done — {title_name}: {result['page_url']}")
+    return result
+
+
+async def create_fb_pages_batch(items: list[tuple[str, str]], concurrency: int = 4,
+                                browser=None) -> list:
+    """
+    Kai titles ek saath — ek browser, har title ka apna context.
+    items: [(title_name, title_id), ...]
+    concurrency: ek waqt mein max kitne pages (FB anti-bot ke hisaab se chhota rakho).
+    Returns: items ke order mein result dict ya Exception (ek fail → baaki chalte rahenge).
+    """
+    if browser is None:
+        async with fb_browser() as own_browser:
+            return await create_fb_pages_batch(items, concurrency, own_browser)
+
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _one(name: str, tid: str) -> dict:
+        async with sem:
+            return await create_fb_page(name, tid, browser=browser, save=False)
+
+    results = await asyncio.gather(*(_one(n, t) for n, t in items), return_exceptions=True)
+
+    # Saare successful pages ek transaction mein
+    rows = [(tid, name, r) for (name, tid), r in zip(items, results) if isinstance(r, dict)]
+    if rows:
+        await asyncio.to_thread(save_batch_to_db, rows)
+    return results
+
+
+async def _create_in_browser(browser, title_name: str, state: dict) -> dict:
+    """Fresh context per page — isolated cookies, but no browser launch cost."""
+    # ── 1. Session restore → login bypass (cookies + localStorage, ek hi call) ─
+    context = await browser.new_context(storage_state=state)
+    context.set_default_timeout(ACTION_TIMEOUT_MS)
+    context.set_default_navigation_timeout(NAVIGATION_TIMEOUT_MS)
+    try:
+        page = await context.new_page()
+        print("[FB] Session restored ✓")
 
         # ── 2. facebook.com/pages/create pe navigate karo ───────────────────
-        await page.goto(
-            "https://www.facebook.com/pages/create",
-            wait_until="networkidle",
-            timeout=30000,
-        )
-        await asyncio.sleep(2)
+        await page.goto("https://www.facebook.com/pages/create", wait_until="domcontentloaded")
 
         # Session valid hai? (login page pe redirect nahi hua)
-        if "login" in page.url or "accounts/login" in page.url:
+        url = page.url
+        if "login" in url:
             raise RuntimeError(
                 "FB session expire ho gayi.\n"
                 "Run: python setup/setup_fb_worker.py"
             )
-        print(f"[FB] pages/create pe hoon ✓  (URL: {page.url})")
+        # FB ke long-poll XHRs kabhi idle nahi hote — seedha name input ka wait karo.
+        # Inputs ke liye "attached" kaafi hai (visibility polling FB ke bhaari DOM pe mehenga hai);
+        # click()/fill() khud actionability check kar lete hain. Yahi handle step 4 mein use hota hai.
+        try:
+            name_input = await page.wait_for_selector(_NAME_SEL, state="attached", timeout=15000)
+        except Exception:
+            name_input = None
+        if not name_input:
+            raise RuntimeError("Page name input field nahi mila. FB ka UI change ho gaya hoga.")
+        print(f"[FB] pages/create pe hoon ✓  (URL: {url})")
 
         # ── 3. GraphQL interceptor — category_ids inject karo ───────────────
+        # (route submit se theek pehle register hota hai, step 6 dekho)
+        injected = False
+        mutation_req = None   # page-creation GraphQL request — iske response mein naya page id aata hai
+
         async def inject_category(route):
+            nonlocal injected, mutation_req
             req = route.request
-            if req.method == "POST" and "graphql" in req.url:
-                body = req.post_data or ""
-                if "additional_profile_plus_create" in body or \
-                   "create_page" in body.lower() or \
-                   "PageCreationMutation" in body:
-                    try:
-                        parsed = urllib.parse.parse_qs(body)
-                        vars_raw = parsed.get("variables", ['{}'])[0]
-                        variables = json.loads(vars_raw)
-
-                        # category_ids inject — har jagah try karo
-                        if "input" in variables:
-                            variables["input"]["category_ids"] = [FB_CATEGORY_ENTERTAINMENT]
-                        else:
-                            variables["category_ids"] = [FB_CATEGORY_ENTERTAINMENT]
-
-                        parsed["variables"] = [json.dumps(variables)]
-                        new_body = urllib.parse.urlencode({k: v[0] for k, v in parsed.items()})
-                        print("[FB] GraphQL intercept → category_ids injected ✓")
-                        await route.continue_(post_data=new_body)
-                        return
-                    except Exception as ex:
-                        print(f"[FB] Interceptor skip (non-fatal): {ex}")
+            # Fast path — 99% GraphQL calls page-creation mutation nahi hain, seedha aage bhejo
+            raw = (
+                req.post_data_buffer
+                if not injected and req.method == "POST" and req.resource_type in ("xhr", "fetch")
+                else None
+            )
+            if not raw or not _CREATE_MUTATION_RE.search(raw):
+                await route.continue_()
+                return
+            mutation_req = req
+            try:
+                # Sirf "variables" field decode/patch karo — poora form parse_qs/urlencode nahi
+                m = _VARIABLES_RE.search(raw)
+                vars_raw = urllib.parse.unquote_plus(m.group(1).decode()) if m else "{}"
+                variables = orjson.loads(vars_raw)
+
+                # category_ids inject — har jagah try karo
+                if "input" in variables:
+                    variables["input"]["category_ids"] = [FB_CATEGORY_ENTERTAINMENT]
+                else:
+                    variables["category_ids"] = [FB_CATEGORY_ENTERTAINMENT]
+
+                encoded = urllib.parse.quote_plus(orjson.dumps(variables)).encode()
+                if m:
+                    new_body = raw[:m.start(1)] + encoded + raw[m.end(1):]
+                else:
+                    new_body = raw + b"&variables=" + encoded
+                print("[FB] GraphQL intercept → category_ids injected ✓")
+                injected = True
+                await route.continue_(post_data=new_body)
+                return
+            except Exception as ex:
+                print(f"[FB] Interceptor skip (non-fatal): {ex}")
             await route.continue_()
 
-        await page.route("**/*graphql*", inject_category)
-
         # ── 4. Page name type karo ───────────────────────────────────────────
         print(f"[FB] Page name type kar raha hoon: {title_name}")
-        name_selectors = [
-            'input[name="name"]',
-            'input[placeholder*="name" i]',
-            'input[aria-label*="Page name" i]',
-            'input[aria-label*="name" i]',
-        ]
-        name_input = None
-        for sel in name_selectors:
-            try:
-                name_input = await page.wait_for_selector(sel, timeout=6000)
-                break
-            except:
-                continue
-
-        if not name_input:
-            raise RuntimeError("Page name input field nahi mila. FB ka UI change ho gaya hoga.")
-
+        # Fixed pacing sleeps nahi — har agla step apne element ke ready hone ka wait karta hai
         await name_input.click()
-        await asyncio.sleep(0.5)
         await name_input.fill(title_name)
-        await asyncio.sleep(1.5)
 
         # ── 5. Category select karo ──────────────────────────────────────────
         print("[FB] Category select kar raha hoon...")
-        cat_selectors = [
-            'input[placeholder*="categor" i]',
-            'input[aria-label*="categor" i]',
-        ]
-        for sel in cat_selectors:
-            try:
-                cat = await page.wait_for_selector(sel, timeout=5000)
-                await cat.click()
-                await asyncio.sleep(0.4)
-                await cat.type("Entertainment", delay=70)
-                await asyncio.sleep(1.5)
-                # First dropdown option click karo
-                opt = await page.wait_for_selector(
-                    '[role="option"]:first-child, [role="listbox"] li:first-child',
-                    timeout=4000
-                )
-                await opt.click()
-                await asyncio.sleep(1)
-                print("[FB] Category selected ✓")
-                break
-            except:
-                continue
+        try:
+            cat = await page.wait_for_selector(_CATEGORY_SEL, state="attached", timeout=5000)
+            await cat.click()
+            # fill() turant — dropdown final string pe react karta hai, keystrokes pe nahi
+            await cat.fill("Entertainment")
+            # First dropdown option click karo (option visible hote hi, fixed sleep nahi)
+            opt = await page.wait_for_selector(_CATEGORY_OPTION_SEL, state="visible", timeout=4000)
+            await opt.click()
+            print("[FB] Category selected ✓")
+            # Dropdown band hone tak ruko — warna wo Create Page button ko dhak sakta hai
+            await page.wait_for_selector('[role="listbox"]', state="hidden", timeout=2000)
+        except Exception:
+            pass
 
         # ── 6. Create Page button click karo ────────────────────────────────
         print("[FB] Create Page click kar raha hoon...")
-        btn_selectors = [
-            'button[type="submit"]',
-            'div[role="button"]:has-text("Create Page")',
-            'div[aria-label*="Create Page" i]',
-            'button:has-text("Create Page")',
-        ]
         btn = None
-        for sel in btn_selectors:
-            try:
-                btn = await page.wait_for_selector(sel, timeout=5000)
-                break
-            except:
-                continue
+        try:
+            # Button clickable hona chahiye — yahan "visible" hi sahi hai
+            btn = await page.wait_for_selector(_CREATE_BUTTON_SEL, state="visible", timeout=5000)
+        except Exception:
+            pass
 
         if not btn:
             raise RuntimeError("Create Page button nahi mila.")
 
-        await asyncio.sleep(0.5)
+        # Mutation ka response aate hi page id — redirect ka wait karne se pehle hi mil jaata hai
+        created: asyncio.Future = asyncio.get_running_loop().create_future()
+
+        async def on_response(resp):
+            if created.done() or mutation_req is None or resp.request is not mutation_req:
+                return
+            try:
+                m = _GRAPHQL_PAGE_ID_RE.search(await resp.body())
+                page_id = (m.group(1) or m.group(2)).decode() if m else None
+            except Exception:
+                page_id = None
+            if not created.done():
+                created.set_result(page_id)
+
+        page.on("response", on_response)
+        # Interceptor sirf submit ke waqt — form bharte hue typeahead GraphQL calls Python tak na aayein
+        await page.route(_GRAPHQL_ROUTE, inject_category)
         await btn.click()
 
-        # ── 7. Naye page ka URL wait karo ────────────────────────────────────
+        # ── 7. Page id (GraphQL response) ya naye page ka URL — jo pehle aaye ──
         print("[FB] Page creation ka wait kar raha hoon...")
-        await page.wait_for_url(
-            lambda u: (
-                re.search(r"facebook\.com/.+/(about|settings|dashboard|posts|manage)", u) or
-                (re.search(r"facebook\.com/\d{5,}", u) and "create" not in u)
-            ) is not None,
-            timeout=30000,
-        )
-        page_url = page.url
+        # "commit" — URL badalte hi lauto; naye page ka poora "load" (default) wait karne ki zaroorat nahi
+        url_wait = asyncio.ensure_future(page.wait_for_url(_PAGE_READY_RE, wait_until="commit"))
+        done, _ = await asyncio.wait({url_wait, created}, return_when=asyncio.FIRST_COMPLETED)
+        page_id = created.result() if created in done else None
+        try:
+            if page_id:
+                url_wait.cancel()
+                page_url = f"https://www.facebook.com/{page_id}"
+            else:
+                try:
+                    await url_wait
+                except Exception:
+                    raise RuntimeError(
+                        f"Create Page click ke baad redirect nahi hua (URL: {page.url})"
+                    ) from None
+                page_url = page.url
+        finally:
+            page.remove_listener("response", on_response)
+            await page.unroute(_GRAPHQL_ROUTE, inject_category)
         print(f"[FB] Page ban gaya! URL: {page_url}")
 
         # ── 8. Page ID extract karo ──────────────────────────────────────────
-        page_id = _extract_page_id(page_url)
+        page_id = page_id or _extract_page_id(page_url)
+        if not page_id:
+            # /<slug>/about jaise URL mein id nahi — DOM mein dhoondo. Regex browser ke andar
+            # chalta hai, sirf match wapas aata hai (page.content() ka MBs ka HTML nahi)
+            try:
+                await page.wait_for_load_state("domcontentloaded")
+                page_id = await page.evaluate(_PAGE_ID_FROM_DOM_JS)
+            except Exception as e:
+                print(f"[FB] DOM se page_id nahi mila (non-fatal): {e}")
 
         # ── 9. Page Access Token fetch karo ─────────────────────────────────
-        page_token = _fetch_page_token(page_id, title_name) if META_SYSTEM_USER_TOKEN else None
+        # requests blocking hai — thread mein chalao taaki baaki batch pages na rukein
+        page_token = (
+            await asyncio.to_thread(_fetch_page_token, page_id, title_name)
+            if META_SYSTEM_USER_TOKEN else None
+        )
 
-        result = {
+        return {
             "page_id": page_id,
             "page_url": page_url,
             "page_token": page_token,
         }
+    finally:
+        await context.close()
 
-    # ── 10. DB mein save karo (browser band hone ke baad) ───────────────────
-    _save_to_db(title_id, title_name, result)
 
-    print(f"[FB] ✅ Done — {title_name}: {page_url}")
-    return result
+def _extract_page_id(url: str) -> str | None:
+    m = _PAGE_ID_RE.search(url)
+    return m.group("id") if m else None
 
 
-def _extract_page_id(url: str) -> str | None:
-    m = re.search(r"facebook\.com/(\d{8,})", url)
-    return m.group(1) if m else None
+# /me/accounts → (fetched_at, {page_id: token}, {name.lower(): token}).
+# Batch mein har page ke liye poori list dobara download nahi — TTL tak ek hi response.
+_ACCOUNTS_TTL = 60  # seconds
+_accounts_cache: tuple[float, dict[str, str], dict[str, str]] | None = None
+_accounts_lock = threading.Lock()
 
 
-def _fetch_page_token(page_id: str | None, page_name: str) -> str | None:
-    try:
-        r = requests.get(
+def _account_tokens(max_age: float) -> tuple[dict[str, str], dict[str, str], bool]:
+    """Returns (by_id, by_name, fetched_now). Lock — concurrent batch threads ek hi fetch share karein."""
+    global _accounts_cache
+    with _accounts_lock:
+        if _accounts_cache and time.monotonic() - _accounts_cache[0] < max_age:
+            return _accounts_cache[1], _accounts_cache[2], False
+        r = _HTTP.get(
             "https://graph.facebook.com/v19.0/me/accounts",
             params={
                 "access_token": META_SYSTEM_USER_TOKEN,
@@ -218,38 +393,65 @@ def _fetch_page_token(page_id: str | None, page_name: str) -> str | None:
             timeout=15,
         )
         r.raise_for_status()
+        by_id, by_name = {}, {}
         for page in r.json().get("data", []):
-            if (page_id and page.get("id") == page_id) or \
-               page.get("name", "").lower() == page_name.lower():
-                return page.get("access_token")
+            token = page.get("access_token")
+            by_id[page.get("id")] = token
+            by_name.setdefault(page.get("name", "").lower(), token)
+        _accounts_cache = (time.monotonic(), by_id, by_name)
+        return by_id, by_name, True
+
+
+def _fetch_page_token(page_id: str | None, page_name: str) -> str | None:
+    try:
+        by_id, by_name, fetched = _account_tokens(_ACCOUNTS_TTL)
+        token = (page_id and by_id.get(page_id)) or by_name.get(page_name.lower())
+        if token is None and not fetched:
+            # Naya page cached list mein abhi nahi hoga — ek baar force refetch
+            by_id, by_name, _ = _account_tokens(0)
+            token = (page_id and by_id.get(page_id)) or by_name.get(page_name.lower())
+        return token
     except Exception as e:
         print(f"[FB] Token fetch failed (non-fatal): {e}")
     return None
 
 
-def _save_to_db(title_id: str, title_name: str, result: dict):
+def _save_to_db(title_id: str, title_name: str, result: dict,
+                audit: AuditBuffer | None = None):
+    """audit: caller-owned buffer that batches events across a job (caller flushes) — None = flush here."""
+    save_batch_to_db([(title_id, title_name, result)], audit)
+
+
+def save_batch_to_db(rows: list[tuple[str, str, dict]], audit: AuditBuffer | None = None):
+    """
+    Kai titles ke results ek hi session + ek commit mein — batch pe N fsyncs ki jagah ek.
+    rows: [(title_id, title_name, result), ...]
+    """
+    own_audit = audit is None
+    audit = AuditBuffer() if own_audit else audit
     session = get_session()
     try:
-        p = session.query(TitleProfile).filter_by(title_id=title_id).first()
-        if not p:
-            p = TitleProfile(title_id=title_id, title_name=title_name, title_type="content")
-            session.add(p)
-        p.fb_page_id  = result.get("page_id")
-        p.fb_page_url = result.get("page_url")
-        p.status      = "fb_done"
-        p.updated_at  = datetime.now(timezone.utc)
-
-        if result.get("page_token"):
-            session.add(TokenVault(
-                title_id=title_id, platform="facebook",
-                token_type="page_token", token_value=result["page_token"],
-            ))
-        session.add(EventLog(
-            entity_type="title", entity_id=title_id,
-            event_type="fb_page_created", event_data=json.dumps(result),
-        ))
+        tokens = []
+        for title_id, title_name, result in rows:
+            upsert_title(
+                session, title_id, title_name,
+                fb_page_id  = result.get("page_id"),
+                fb_page_url = result.get("page_url"),
+                status      = "fb_done",
+            )
+            if result.get("page_token"):
+                tokens.append({
+                    "title_id": title_id, "platform": "facebook",
+                    "token_type": "page_token", "token_value": result["page_token"],
+                })
+            audit.log("title", title_id, "fb_page_created", orjson.dumps(result).decode())
+
+        if tokens:
+            session.execute(insert(TokenVault), tokens)
+        if own_audit:
+            audit.flush(session)
         session.commit()
-        print("[DB] Saved ✓")
+        print(f"[DB] Saved ✓ ({len(rows)})" if len(rows) > 1 else "[DB] Saved ✓")
     except Exception as e:
         session.rollback()
         print(f"[DB] Save failed: {e}")
@@ -260,5 +462,10 @@ def _save_to_db(title_id: str, title_name: str, result: dict):
 if __name__ == "__main__":
     name = sys.argv[1] if len(sys.argv) > 1 else "STAGE Test Page"
     tid  = sys.argv[2] if len(sys.argv) > 2 else "test_001"
-    result = asyncio.run(create_fb_page(name, tid))
-    print(f"\nResult: {json.dumps(result, indent=2)}")
+
+    async def _main():
+        async with fb_browser() as browser:
+            return await create_fb_page(name, tid, browser=browser)
+
+    result = asyncio.run(_main())
+    print(f"\nResult: {orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()}")
@@ -21,11 +21,19 @@ Prerequisites:
 """
 
 import time
+import queue
+import asyncio
 import random
+import string
 import logging
+import secrets
+import httpx
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 log = logging.getLogger(__name__)
 
@@ -57,14 +65,23 @@ class GeeLarkClient:
             "Authorization": f"Bearer {api_token}",
             "Content-Type":  "application/json",
         }
+        # One keep-alive session per client — wait_for_device_ready alone polls get_device
+        # up to 24 times. Retries follow urllib3's default method list (no POST), so
+        # non-idempotent calls like /devices/launch are never replayed.
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=4, pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504]),
+        ))
 
     def _post(self, path: str, payload: dict) -> dict:
-        r = requests.post(f"{self.base_url}{path}", headers=self.headers, json=payload, timeout=30)
+        r = self.session.post(f"{self.base_url}{path}", json=payload, timeout=30)
         r.raise_for_status()
         return r.json()
 
     def _get(self, path: str) -> dict:
-        r = requests.get(f"{self.base_url}{path}", headers=self.headers, timeout=30)
+        r = self.session.get(f"{self.base_url}{path}", timeout=30)
         r.raise_for_status()
         return r.json()
 
@@ -103,9 +120,13 @@ class GeeLarkClient:
         })
 
     def wait_for_device_ready(self, device_id: str, max_wait: int = 120) -> bool:
-        """Poll until device status is 'running'."""
-        for _ in range(max_wait // 5):
-            time.sleep(5)
+        """
+        Poll until device status is 'running'.
+        Checks immediately, then backs off 1s → ×1.5 → 8s cap (+jitter) until max_wait.
+        """
+        deadline = time.monotonic() + max_wait
+        delay    = 1.0
+        while True:
             try:
                 info   = self.get_device(device_id)
                 status = info.get("status", "")
@@ -114,7 +135,87 @@ class GeeLarkClient:
                     return True
             except Exception as e:
                 log.warning(f"GeeLark poll error: {e}")
-        return False
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(delay + random.uniform(0, 0.3), remaining))
+            delay = min(delay * 1.5, 8.0)
+
+
+class GeeLarkAsyncClient:
+    """
+    Async mirror of GeeLarkClient on one pooled httpx.AsyncClient — a single event
+    loop can drive many device boots at once instead of a blocked thread per account.
+    """
+
+    def __init__(self, api_token: str, base_url: str = "https://api.geelark.com"):
+        self.client = httpx.AsyncClient(
+            base_url  = base_url,
+            headers   = {
+                "Authorization": f"Bearer {api_token}",
+                "Content-Type":  "application/json",
+            },
+            timeout   = 30,
+            limits    = httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            transport = httpx.AsyncHTTPTransport(retries=3),
+        )
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def _post(self, path: str, payload: dict) -> dict:
+        r = await self.client.post(path, json=payload)
+        r.raise_for_status()
+        return r.json()
+
+    async def _get(self, path: str) -> dict:
+        r = await self.client.get(path)
+        r.raise_for_status()
+        return r.json()
+
+    async def create_device(self, name: str, proxy_url: str, android_version: str = "Android12") -> dict:
+        return await self._post("/devices/launch", {
+            "name":    name,
+            "os":      android_version,
+            "proxy":   proxy_url,
+        })
+
+    async def get_device(self, device_id: str) -> dict:
+        return await self._get(f"/devices/{device_id}")
+
+    async def install_app(self, device_id: str, package_name: str) -> dict:
+        return await self._post(f"/devices/{device_id}/install", {"package": package_name})
+
+    async def trigger_warmup(self, device_id: str, template_id: str) -> dict:
+        return await self._post("/tasks", {
+            "device_id":   device_id,
+            "template_id": template_id,
+        })
+
+    async def wait_for_device_ready(self, device_id: str, max_wait: int = 120) -> bool:
+        """Same backoff schedule as GeeLarkClient.wait_for_device_ready."""
+        deadline = time.monotonic() + max_wait
+        delay    = 1.0
+        while True:
+            try:
+                info   = await self.get_device(device_id)
+                status = info.get("status", "")
+                log.info(f"GeeLark device {device_id} status: {status}")
+                if status in ("running", "online", "active"):
+                    return True
+            except Exception as e:
+                log.warning(f"GeeLark poll error: {e}")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(delay + random.uniform(0, 0.3), remaining))
+            delay = min(delay * 1.5, 8.0)
 
 
 # ── ADB + Appium connection ───────────────────────────────────────────────────
@@ -122,18 +223,23 @@ class GeeLarkClient:
 def _adb_connect(ip: str, port: int, auth_code: str) -> bool:
     """Connect ADB to a GeeLark cloud phone."""
     import subprocess
+    serial = f"{ip}:{port}"
     try:
-        subprocess.run(["adb", "connect", f"{ip}:{port}"], check=True, capture_output=True)
-        subprocess.run(["adb", "-s", f"{ip}:{port}", "shell", "glogin", auth_code],
-                       check=True, capture_output=True)
+        # Timeouts so a hung adb can't stall the worker forever
+        subprocess.run(["adb", "connect", serial], check=True, capture_output=True, timeout=10)
+        subprocess.run(["adb", "-s", serial, "shell", "glogin", auth_code],
+                       check=True, capture_output=True, timeout=10)
         time.sleep(3)
         return True
-    except subprocess.CalledProcessError as e:
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
         log.error(f"ADB connect failed: {e}")
         return False
 
-def _get_appium_driver(ip: str, port: int):
-    """Connect Appium to a GeeLark cloud phone running Instagram."""
+def _get_appium_driver(ip: str, port: int, skip_server_install: bool = False):
+    """
+    Connect Appium to a GeeLark cloud phone running Instagram.
+    Pass skip_server_install=True when the UiAutomator2 server is already on the image.
+    """
     from appium import webdriver
 
     caps = {
@@ -145,17 +251,37 @@ def _get_appium_driver(ip: str, port: int):
         "appActivity":       ".activity.MainTabActivity",
         "noReset":           True,
         "newCommandTimeout": 300,
+        # UiAutomator2 waits up to 10s for UI idle before every lookup — IG's
+        # onboarding animations keep it busy, so don't wait for idle at all
+        "waitForIdleTimeout":     0,
+        "waitForSelectorTimeout": 5000,
+        "disableWindowAnimation": True,
+        "skipServerInstallation": skip_server_install,
     }
     return webdriver.Remote("http://localhost:4723/wd/hub", caps)
 
 
 # ── Instagram signup automation ───────────────────────────────────────────────
 
+# Exact resource IDs for the signup fields — AppiumBy.ID is a direct lookup, whereas
+# resourceIdMatches(".*x.*") regex-tests every node in the hierarchy
+_IG_RESOURCE_IDS = {
+    "phone_number":      "com.instagram.android:id/phone_number",
+    "confirmation_code": "com.instagram.android:id/confirmation_code",
+    "full_name":         "com.instagram.android:id/full_name",
+    "password":          "com.instagram.android:id/password",
+    "username":          "com.instagram.android:id/username",
+}
+
+# Keystrokes sent one at a time with jitter before the rest of a field goes in one
+# send_keys — each send_keys is a full Appium → UiAutomator2 round-trip
+_HUMAN_TYPED_CHARS = 3
+
+_PASSWORD_ALPHABET = string.ascii_letters + string.digits + "!@#$%"
+
 def _generate_password() -> str:
-    """Generate a strong random password."""
-    import string
-    chars = string.ascii_letters + string.digits + "!@#$%"
-    return "".join(random.choices(chars, k=16))
+    """Generate a strong random password (CSPRNG — these are real account credentials)."""
+    return "".join(secrets.choice(_PASSWORD_ALPHABET) for _ in range(16))
 
 def _delay(min_s: float, max_s: float):
     time.sleep(random.uniform(min_s, max_s))
@@ -174,6 +300,7 @@ def _signup_instagram(driver, ig_handle: str, phone: str, otp_getter) -> dict:
         dict with username, password, success
     """
     from appium.webdriver.common.appiumby import AppiumBy
+    from selenium.common.exceptions import TimeoutException
 
     password = _generate_password()
 
@@ -185,18 +312,42 @@ def _signup_instagram(driver, ig_handle: str, phone: str, otp_getter) -> dict:
         )
 
     def tap_text(text: str, timeout: int = 10):
-        el = find(AppiumBy.ANDROID_UIAUTOMATOR,
-                  f'new UiSelector().textContains("{text}")', timeout)
-        el.click()
+        # Always a fresh lookup — "Next" on the following screen is a different node, and
+        # UiAutomator2 doesn't reliably raise StaleElementReference for the old one
+        find(AppiumBy.ANDROID_UIAUTOMATOR,
+             f'new UiSelector().textContains("{text}")', timeout).click()
         _delay(0.5, 1.2)
 
-    def type_field(resource_id_fragment: str, text: str):
-        el = find(AppiumBy.ANDROID_UIAUTOMATOR,
-                  f'new UiSelector().resourceIdMatches(".*{resource_id_fragment}.*")')
+    def clear_field(resource_id_fragment: str):
+        """
+        Exact resource ID first; resourceIdContains fallback if IG renamed the view.
+        Returns the field so the caller types into it on the same screen without a re-find.
+        """
+        full_id = _IG_RESOURCE_IDS.get(resource_id_fragment)
+        el = None
+        if full_id:
+            try:
+                el = find(AppiumBy.ID, full_id, timeout=3)
+            except TimeoutException:
+                pass
+        if el is None:
+            el = find(AppiumBy.ANDROID_UIAUTOMATOR,
+                      f'new UiSelector().resourceIdContains("{resource_id_fragment}")')
         el.clear()
-        for char in text:
+        return el
+
+    def type_human(el, text: str, min_s: float = 0.05, max_s: float = 0.15):
+        """Typing rhythm on the first few keystrokes, then the rest in one RPC."""
+        head, rest = text[:_HUMAN_TYPED_CHARS], text[_HUMAN_TYPED_CHARS:]
+        for char in head:
             el.send_keys(char)
-            time.sleep(random.uniform(0.05, 0.15))
+            time.sleep(random.uniform(min_s, max_s))
+        if rest:
+            el.send_keys(rest)
+
+    def type_field(resource_id_fragment: str, text: str):
+        el = clear_field(resource_id_fragment)
+        type_human(el, text)
         _delay(0.3, 0.8)
 
     try:
@@ -243,12 +394,8 @@ def _signup_instagram(driver, ig_handle: str, phone: str, otp_getter) -> dict:
 
         # Username — clear default and set our handle
         try:
-            username_field = find(AppiumBy.ANDROID_UIAUTOMATOR,
-                                  'new UiSelector().resourceIdMatches(".*username.*")')
-            username_field.clear()
-            for char in ig_handle:
-                username_field.send_keys(char)
-                time.sleep(random.uniform(0.05, 0.12))
+            username_field = clear_field("username")
+            type_human(username_field, ig_handle, 0.05, 0.12)
             _delay(1.0, 2.0)
             tap_text("Next")
         except Exception as e:
@@ -256,13 +403,15 @@ def _signup_instagram(driver, ig_handle: str, phone: str, otp_getter) -> dict:
 
         _delay(2.0, 4.0)
 
-        # Skip optional steps (contacts, notifications, etc.)
-        for skip_text in ["Not Now", "Skip", "Later", "Allow"]:
+        # Skip optional steps (contacts, notifications, etc.) — one OR-query per screen
+        # with a short bound, instead of a full 10s lookup per possibly-missing button
+        for _ in range(4):
             try:
-                tap_text(skip_text)
+                find(AppiumBy.ANDROID_UIAUTOMATOR,
+                     'new UiSelector().textMatches("Not Now|Skip|Later|Allow")', timeout=2).click()
                 _delay(0.5, 1.0)
             except Exception:
-                pass
+                break
 
         return {
             "success":  True,
@@ -275,8 +424,155 @@ def _signup_instagram(driver, ig_handle: str, phone: str, otp_getter) -> dict:
         return {"success": False, "error": str(e)}
 
 
+# ── OTP number pre-warming ────────────────────────────────────────────────────
+
+# How long a signup waits on the pre-warmed pool before giving up on that account
+_OTP_POOL_WAIT_S = 120
+
+def prewarm_otp_pool(n: int, service: str = "smsman", api_key: str = "",
+                     country=None, max_workers: int = 4) -> "queue.Queue":
+    """
+    Start buying n OTP numbers in the background and return the queue they land on.
+    Pass it to create_instagram_account(otp_pool=...) so number acquisition overlaps
+    device boot instead of sitting on each account's critical path.
+
+    Only the number is bought here (otp=None) — the SMS can't arrive until a device
+    has submitted it to Instagram, so signup waits for the code itself.
+    """
+    from workers.otp_service import _CLIENTS, _DEFAULT_COUNTRY, OTPResult
+
+    if service not in _CLIENTS:
+        raise ValueError(f"Unknown OTP service: {service}")
+    client_cls, get_number = _CLIENTS[service]
+    country = _DEFAULT_COUNTRY[service] if country is None else country
+
+    def _acquire() -> OTPResult:
+        request_id, phone = get_number(client_cls(api_key), country)
+        return OTPResult(success=True, phone=phone, request_id=request_id, service=service)
+
+    pool     = queue.Queue()
+    executor = ThreadPoolExecutor(max_workers=max(1, min(n, max_workers)))
+
+    def _enqueue(fut):
+        try:
+            pool.put(fut.result())
+        except Exception as e:
+            pool.put(OTPResult(success=False, error=str(e), service=service))
+
+    for _ in range(n):
+        executor.submit(_acquire).add_done_callback(_enqueue)
+    executor.shutdown(wait=False)
+    return pool
+
+
 # ── Main worker ───────────────────────────────────────────────────────────────
 
+def _resolve_settings(
+    geelark_api_token: str, proxy_url: str, otp_service: str,
+    otp_api_key: str, warmup_template_id: str, android_version: str,
+) -> tuple[str, str, str, str, str, str]:
+    """Fill unset create_instagram_account args from config."""
+    # Load from config if not provided
+    if not geelark_api_token or not proxy_url or not otp_api_key:
+        from config.settings import (
+            GEELARK_API_TOKEN, PROXY_URL,
+            OTP_SERVICE, SMSMAN_API_KEY, FIVESIM_API_KEY,
+            GEELARK_ANDROID_VERSION, GEELARK_WARMUP_TEMPLATE_ID,
+        )
+        geelark_api_token  = geelark_api_token  or GEELARK_API_TOKEN
+        proxy_url          = proxy_url           or PROXY_URL
+        otp_service        = otp_service         or OTP_SERVICE
+        otp_api_key        = otp_api_key         or (SMSMAN_API_KEY if otp_service == "smsman" else FIVESIM_API_KEY)
+        android_version    = android_version     or GEELARK_ANDROID_VERSION
+        warmup_template_id = warmup_template_id  or GEELARK_WARMUP_TEMPLATE_ID
+    return geelark_api_token, proxy_url, otp_service, otp_api_key, warmup_template_id, android_version
+
+
+def _signup_on_device(
+    info:        dict,
+    device_id:   str,
+    ig_handle:   str,
+    otp_service: str,
+    otp_api_key: str,
+    otp_pool:    Optional["queue.Queue"],
+) -> IGAccountResult:
+    """
+    Steps 4–7 on a booted device: ADB connect, OTP number, Appium signup.
+    Blocking — shared by the sync and async workers. warmup_status is left to the caller.
+    """
+    adb_ip    = info.get("adb_ip") or info.get("ip")
+    adb_port  = int(info.get("adb_port") or info.get("port", 5555))
+    auth_code = info.get("auth_code") or info.get("adb_auth", "")
+
+    if not adb_ip:
+        return IGAccountResult(success=False, device_id=device_id,
+                               error="Could not get ADB connection info from GeeLark")
+
+    # ── Step 5: Connect ADB ────────────────────────────────────────────
+    log.info(f"Connecting ADB to {adb_ip}:{adb_port}")
+    if not _adb_connect(adb_ip, adb_port, auth_code):
+        return IGAccountResult(success=False, device_id=device_id,
+                               error="ADB connection failed")
+
+    # ── Step 6: Get OTP number ─────────────────────────────────────────
+    if otp_pool is not None:
+        log.info("Taking OTP number from pre-warmed pool...")
+        try:
+            otp_result = otp_pool.get(timeout=_OTP_POOL_WAIT_S)
+        except queue.Empty:
+            return IGAccountResult(success=False, device_id=device_id,
+                                   error=f"No pre-warmed OTP number within {_OTP_POOL_WAIT_S}s")
+    else:
+        from workers.otp_service import get_instagram_otp
+        log.info(f"Requesting OTP number from {otp_service}...")
+        otp_result = get_instagram_otp(service=otp_service, api_key=otp_api_key)
+    if not otp_result.success or not otp_result.phone:
+        return IGAccountResult(success=False, device_id=device_id,
+                               error=f"OTP number acquisition failed: {otp_result.error}")
+
+    phone = otp_result.phone
+    log.info(f"Got phone number: {phone}")
+
+    # ── Step 7: Connect Appium + automate signup ───────────────────────
+    log.info("Connecting Appium...")
+    driver = _get_appium_driver(adb_ip, adb_port)
+
+    # OTP getter — OTP may already be in otp_result, or we need to wait
+    if otp_result.otp:
+        otp_code = otp_result.otp
+        otp_getter = lambda: otp_code
+    else:
+        from workers.otp_service import SMSManClient, FiveSimClient
+        # A pooled number belongs to the service it was bought from
+        if (otp_result.service or otp_service) == "smsman":
+            client = SMSManClient(otp_api_key)
+            otp_getter = lambda: client.wait_for_otp(otp_result.request_id)
+        else:
+            client = FiveSimClient(otp_api_key)
+            otp_getter = lambda: client.wait_for_otp(otp_result.request_id)
+
+    log.info("Starting Instagram signup automation...")
+    signup = _signup_instagram(driver, ig_handle, phone, otp_getter)
+    driver.quit()
+
+    if not signup.get("success"):
+        return IGAccountResult(
+            success=False,
+            device_id=device_id,
+            phone_used=phone,
+            error=signup.get("error", "Signup automation failed"),
+        )
+
+    return IGAccountResult(
+        success     = True,
+        ig_handle   = f"@{ig_handle}",
+        ig_username = ig_handle,
+        ig_password = signup["password"],
+        phone_used  = phone,
+        device_id   = device_id,
+    )
+
+
 def create_instagram_account(
     ig_handle:           str,
     geelark_api_token:   str = "",
@@ -285,6 +581,7 @@ def create_instagram_account(
     otp_api_key:         str = "",
     warmup_template_id:  str = "instagram-ai-account-warmup",
     android_version:     str = "Android12",
+    otp_pool:            Optional["queue.Queue"] = None,
 ) -> IGAccountResult:
     """
     Create a fresh Instagram account on a GeeLark cloud phone.
@@ -297,23 +594,15 @@ def create_instagram_account(
         otp_api_key:        API key for the OTP service
         warmup_template_id: GeeLark automation template ID for IG warmup
         android_version:    "Android11" or "Android12"
+        otp_pool:           Queue from prewarm_otp_pool() — take a pre-acquired number
+                            from it instead of requesting one inline
 
     Returns:
         IGAccountResult
     """
-    # Load from config if not provided
-    if not geelark_api_token or not proxy_url or not otp_api_key:
-        from config.settings import (
-            GEELARK_API_TOKEN, PROXY_URL,
-            OTP_SERVICE, SMSMAN_API_KEY, FIVESIM_API_KEY,
-            GEELARK_ANDROID_VERSION, GEELARK_WARMUP_TEMPLATE_ID,
-        )
-        geelark_api_token  = geelark_api_token  or GEELARK_API_TOKEN
-        proxy_url          = proxy_url           or PROXY_URL
-        otp_service        = otp_service         or OTP_SERVICE
-        otp_api_key        = otp_api_key         or (SMSMAN_API_KEY if otp_service == "smsman" else FIVESIM_API_KEY)
-        android_version    = android_version     or GEELARK_ANDROID_VERSION
-        warmup_template_id = warmup_template_id  or GEELARK_WARMUP_TEMPLATE_ID
+    geelark_api_token, proxy_url, otp_service, otp_api_key, warmup_template_id, android_version = \
+        _resolve_settings(geelark_api_token, proxy_url, otp_service, otp_api_key,
+                          warmup_template_id, android_version)
 
     geelark   = GeeLarkClient(geelark_api_token)
     device_id = None
@@ -329,92 +618,121 @@ def create_instagram_account(
 
         log.info(f"GeeLark device created: {device_id}")
 
-        # ── Step 2: Wait for device to be running ─────────────────────────
-        if not geelark.wait_for_device_ready(device_id):
-            return IGAccountResult(success=False, device_id=device_id,
-                                   error="GeeLark device did not become ready within 2 minutes")
-
-        # ── Step 3: Install Instagram ──────────────────────────────────────
-        log.info("Installing Instagram on cloud phone...")
-        geelark.install_app(device_id, "com.instagram.android")
-        time.sleep(15)  # wait for install
+        # ── Step 2+3: Wait for device + install Instagram (pipelined) ─────
+        # GeeLark queues the install until the phone is up, so kick it off right away
+        # instead of paying boot time + install time back to back.
+        def _install():
+            log.info("Installing Instagram on cloud phone...")
+            geelark.install_app(device_id, "com.instagram.android")
+            time.sleep(15)  # wait for install
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            install = pool.submit(_install)
+            ready   = pool.submit(geelark.wait_for_device_ready, device_id)
+            if not ready.result():
+                return IGAccountResult(success=False, device_id=device_id,
+                                       error="GeeLark device did not become ready within 2 minutes")
+            install.result()
 
         # ── Step 4: Get ADB connection info ────────────────────────────────
         log.info("Getting ADB connection info...")
-        info    = geelark.get_device(device_id)
-        adb_ip   = info.get("adb_ip") or info.get("ip")
-        adb_port = int(info.get("adb_port") or info.get("port", 5555))
-        auth_code = info.get("auth_code") or info.get("adb_auth", "")
+        info   = geelark.get_device(device_id)
+        result = _signup_on_device(info, device_id, ig_handle, otp_service, otp_api_key, otp_pool)
+        if not result.success:
+            return result
 
-        if not adb_ip:
-            return IGAccountResult(success=False, device_id=device_id,
-                                   error="Could not get ADB connection info from GeeLark")
+        # ── Step 8: Trigger GeeLark AI warmup template ─────────────────────
+        log.info(f"Triggering GeeLark AI warmup template: {warmup_template_id}")
+        try:
+            geelark.trigger_warmup(device_id, warmup_template_id)
+            result.warmup_status = "warming_up"
+            log.info("Warmup template triggered — will run for 30 days")
+        except Exception as e:
+            log.warning(f"Warmup trigger failed (non-fatal): {e}")
+            result.warmup_status = "warmup_trigger_failed"
 
-        # ── Step 5: Connect ADB ────────────────────────────────────────────
-        log.info(f"Connecting ADB to {adb_ip}:{adb_port}")
-        if not _adb_connect(adb_ip, adb_port, auth_code):
-            return IGAccountResult(success=False, device_id=device_id,
-                                   error="ADB connection failed")
+        return result
 
-        # ── Step 6: Get OTP number ─────────────────────────────────────────
-        from workers.otp_service import get_instagram_otp
-        log.info(f"Requesting OTP number from {otp_service}...")
-        otp_result = get_instagram_otp(service=otp_service, api_key=otp_api_key)
-        if not otp_result.success or not otp_result.phone:
-            return IGAccountResult(success=False, device_id=device_id,
-                                   error=f"OTP number acquisition failed: {otp_result.error}")
+    except Exception as e:
+        log.error(f"Instagram account creation error: {e}")
+        return IGAccountResult(
+            success=False,
+            device_id=device_id,
+            error=str(e),
+        )
 
-        phone = otp_result.phone
-        log.info(f"Got phone number: {phone}")
 
-        # ── Step 7: Connect Appium + automate signup ───────────────────────
-        log.info("Connecting Appium...")
-        driver = _get_appium_driver(adb_ip, adb_port)
+async def create_instagram_account_async(
+    ig_handle:           str,
+    geelark_api_token:   str = "",
+    proxy_url:           str = "",
+    otp_service:         str = "smsman",
+    otp_api_key:         str = "",
+    warmup_template_id:  str = "instagram-ai-account-warmup",
+    android_version:     str = "Android12",
+    otp_pool:            Optional["queue.Queue"] = None,
+    geelark:             Optional["GeeLarkAsyncClient"] = None,
+) -> IGAccountResult:
+    """
+    Async create_instagram_account — GeeLark calls run on the event loop, the blocking
+    ADB/OTP/Appium steps in a worker thread. Pass a shared GeeLarkAsyncClient to drive
+    many accounts concurrently over one connection pool.
+    """
+    geelark_api_token, proxy_url, otp_service, otp_api_key, warmup_template_id, android_version = \
+        _resolve_settings(geelark_api_token, proxy_url, otp_service, otp_api_key,
+                          warmup_template_id, android_version)
 
-        # OTP getter — OTP may already be in otp_result, or we need to wait
-        if otp_result.otp:
-            otp_code = otp_result.otp
-            otp_getter = lambda: otp_code
-        else:
-            from workers.otp_service import SMSManClient, FiveSimClient
-            if otp_service == "smsman":
-                client = SMSManClient(otp_api_key)
-                otp_getter = lambda: client.wait_for_otp(otp_result.request_id)
-            else:
-                client = FiveSimClient(otp_api_key)
-                otp_getter = lambda: client.wait_for_otp(otp_result.request_id)
-
-        log.info("Starting Instagram signup automation...")
-        signup = _signup_instagram(driver, ig_handle, phone, otp_getter)
-        driver.quit()
-
-        if not signup.get("success"):
-            return IGAccountResult(
-                success=False,
-                device_id=device_id,
-                phone_used=phone,
-                error=signup.get("error", "Signup automation failed"),
-            )
+    own_client = geelark is None
+    if own_client:
+        geelark = GeeLarkAsyncClient(geelark_api_token)
+    device_id = None
+
+    try:
+        # ── Step 1: Create GeeLark cloud phone ────────────────────────────
+        device_name = f"stage_{ig_handle}_{int(time.time())}"
+        log.info(f"Creating GeeLark cloud phone: {device_name}")
+        device_info = await geelark.create_device(device_name, proxy_url, android_version)
+        device_id   = device_info.get("device_id") or device_info.get("id")
+        if not device_id:
+            return IGAccountResult(success=False, error=f"GeeLark device creation failed: {device_info}")
+
+        log.info(f"GeeLark device created: {device_id}")
+
+        # ── Step 2+3: Wait for device + install Instagram (pipelined) ─────
+        async def _install():
+            log.info("Installing Instagram on cloud phone...")
+            await geelark.install_app(device_id, "com.instagram.android")
+            await asyncio.sleep(15)  # wait for install
+
+        install = asyncio.ensure_future(_install())
+        try:
+            if not await geelark.wait_for_device_ready(device_id):
+                return IGAccountResult(success=False, device_id=device_id,
+                                       error="GeeLark device did not become ready within 2 minutes")
+        finally:
+            await asyncio.gather(install, return_exceptions=True)
+        install.result()
+
+        # ── Step 4–7: ADB + OTP + Appium signup (blocking → thread) ───────
+        log.info("Getting ADB connection info...")
+        info   = await geelark.get_device(device_id)
+        result = await asyncio.to_thread(
+            _signup_on_device, info, device_id, ig_handle, otp_service, otp_api_key, otp_pool,
+        )
+        if not result.success:
+            return result
 
         # ── Step 8: Trigger GeeLark AI warmup template ─────────────────────
         log.info(f"Triggering GeeLark AI warmup template: {warmup_template_id}")
         try:
-            geelark.trigger_warmup(device_id, warmup_template_id)
-            warmup_status = "warming_up"
+            await geelark.trigger_warmup(device_id, warmup_template_id)
+            result.warmup_status = "warming_up"
             log.info("Warmup template triggered — will run for 30 days")
         except Exception as e:
             log.warning(f"Warmup trigger failed (non-fatal): {e}")
-            warmup_status = "warmup_trigger_failed"
+            result.warmup_status = "warmup_trigger_failed"
 
-        return IGAccountResult(
-            success       = True,
-            ig_handle     = f"@{ig_handle}",
-            ig_username   = ig_handle,
-            ig_password   = signup["password"],
-            phone_used    = phone,
-            device_id     = device_id,
-            warmup_status = warmup_status,
-        )
+        return result
 
     except Exception as e:
         log.error(f"Instagram account creation error: {e}")
@@ -423,6 +741,9 @@ def create_instagram_account(
             device_id=device_id,
             error=str(e),
         )
+    finally:
+        if own_client:
+            await geelark.aclose()
 
 
 # ── CLI test ──────────────────────────────────────────────────────────────────
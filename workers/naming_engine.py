@@ -12,13 +12,33 @@ Install: pip install indic-transliteration
 
 import re
 import unicodedata
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+import orjson
+
+try:
+    from indic_transliteration import sanscript as _SANSCRIPT
+    from indic_transliteration.sanscript import transliterate as _TRANSLITERATE
+except ImportError:
+    _SANSCRIPT = _TRANSLITERATE = None
+
+
+# ── Precompiled patterns (used on every handle generation) ─────────────────
+_RE_NON_ALNUM_LOWER = re.compile(r"[^a-z0-9]+")
+_RE_NON_IG          = re.compile(r"[^a-z0-9_.]")
+_RE_DOT_RUN         = re.compile(r"\.{2,}")
+_RE_NON_FB          = re.compile(r"[^a-zA-Z0-9.]")
+_RE_NON_YT          = re.compile(r"[^a-zA-Z0-9_.\-]")
+_RE_WS              = re.compile(r"\s+")
+_RE_DEVANAGARI      = re.compile(r"[\u0900-\u097F]")
 
 
 # ── Canonical overrides for known district names ───────────────────────────
 # Use official English spellings directly (no transliteration needed)
-DISTRICT_CANONICAL: dict[str, str] = {
+DISTRICT_CANONICAL: Mapping[str, str] = MappingProxyType({
     "banswara":    "Banswara",
     "dungarpur":   "Dungarpur",
     "pratapgarh":  "Pratapgarh",
@@ -31,12 +51,16 @@ DISTRICT_CANONICAL: dict[str, str] = {
     "jhalawar":    "Jhalawar",
     "chittorgarh": "Chittorgarh",
     "bhilwara":    "Bhilwara",
-}
+})
+_DISTRICT_LOWER = frozenset(DISTRICT_CANONICAL)
 
 
-@dataclass
+@dataclass(frozen=True)
 class SocialHandles:
-    """All platform handles generated for a title."""
+    """
+    All platform handles generated for a title.
+    Frozen: generate_handles() is memoized, so every caller shares the same instance.
+    """
     input_title:   str
     roman_form:    str        # clean Roman transliteration
     slug:          str        # kebab-case for URLs/filenames
@@ -47,32 +71,49 @@ class SocialHandles:
     yt_channel_name: str      # display name (Devanagari if Hindi)
     yt_handle:     str        # @StageTitleName (without @)
 
+    # Derived once — as_dict() is rebuilt per API response / job row
+    ig_handle_at:  str = field(init=False, repr=False)
+    fb_url:        str = field(init=False, repr=False)
+    yt_handle_at:  str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        # frozen → plain assignment raises; derived fields go in via object.__setattr__
+        object.__setattr__(self, "ig_handle_at", f"@{self.ig_handle}")
+        object.__setattr__(self, "fb_url",       f"https://facebook.com/{self.fb_username}")
+        object.__setattr__(self, "yt_handle_at", f"@{self.yt_handle}")
+
     def as_dict(self) -> dict:
         return {
             "input_title":      self.input_title,
             "roman_form":       self.roman_form,
             "slug":             self.slug,
             "instagram": {
-                "handle":       f"@{self.ig_handle}",
+                "handle":       self.ig_handle_at,
                 "handle_raw":   self.ig_handle,
             },
             "facebook": {
                 "page_name":    self.fb_page_name,
                 "username":     self.fb_username,
-                "url":          f"https://facebook.com/{self.fb_username}",
+                "url":          self.fb_url,
             },
             "youtube": {
                 "channel_name": self.yt_channel_name,
-                "handle":       f"@{self.yt_handle}",
+                "handle":       self.yt_handle_at,
                 "handle_raw":   self.yt_handle,
             },
         }
 
+    @cached_property
+    def as_json(self) -> str:
+        """as_dict() serialized once — reused by DB.create_job and API responses."""
+        return orjson.dumps(self.as_dict()).decode()
+
 
 # ── Devanagari detection ───────────────────────────────────────────────────
 
+@lru_cache(maxsize=4096)
 def _has_devanagari(text: str) -> bool:
-    return any("\u0900" <= ch <= "\u097F" for ch in text)
+    return _RE_DEVANAGARI.search(text) is not None
 
 
 # ── Transliteration ────────────────────────────────────────────────────────
@@ -97,42 +138,39 @@ def _preprocess_nuqta(text: str) -> str:
         text = text.replace(src, dst)
     return text
 
+# HK → readable ASCII:
+# Long vowels: A→a, I→i, U→u
+# Anusvara M → n, Visarga H → drop
+_HK_FIX_TABLE = str.maketrans({"A": "a", "I": "i", "U": "u", "M": "n", "H": None})
+
 def _transliterate(text: str) -> str:
     """
     Devanagari → clean Roman ASCII suitable for social handles.
     Uses Harvard-Kyoto (HK) scheme which produces pure ASCII output.
     Falls back to Unicode normalization if library not installed.
     """
-    try:
-        from indic_transliteration import sanscript
-        from indic_transliteration.sanscript import transliterate
-
-        text = _preprocess_nuqta(text)
-        hk = transliterate(text, sanscript.DEVANAGARI, sanscript.HK)
-
-        # HK → readable ASCII:
-        # Long vowels: A→a, I→i, U→u
-        # Anusvara M → n, Visarga H → drop
-        for src, dst in [("A", "a"), ("I", "i"), ("U", "u"), ("M", "n"), ("H", "")]:
-            hk = hk.replace(src, dst)
-
-        hk = hk.lower()
-        hk = hk.encode("ascii", errors="ignore").decode("ascii")
-        hk = re.sub(r"\s+", " ", hk).strip()
-        return hk
-
-    except ImportError:
+    if _TRANSLITERATE is None:
         # Fallback: Unicode NFKD strip
         text = unicodedata.normalize("NFKD", text)
         text = text.encode("ascii", errors="ignore").decode("ascii")
         return text.lower().strip()
 
+    text = _preprocess_nuqta(text)
+    hk = _TRANSLITERATE(text, _SANSCRIPT.DEVANAGARI, _SANSCRIPT.HK)
+    hk = hk.translate(_HK_FIX_TABLE)
+
+    hk = hk.lower()
+    hk = hk.encode("ascii", errors="ignore").decode("ascii")
+    hk = _RE_WS.sub(" ", hk).strip()
+    return hk
+
 
+@lru_cache(maxsize=4096)
 def _to_roman(title: str) -> str:
     """Convert title (Hindi or English) to clean Roman form."""
     # Check if it matches a canonical district name first
     lower = title.lower().strip()
-    if lower in DISTRICT_CANONICAL:
+    if lower in _DISTRICT_LOWER:
         return DISTRICT_CANONICAL[lower].lower()
 
     if _has_devanagari(title):
@@ -146,7 +184,7 @@ def _to_roman(title: str) -> str:
 def to_slug(title: str, separator: str = "-") -> str:
     """'बांसवाड़ा की कहानी' → 'banswada-ki-kahani'"""
     roman = _to_roman(title)
-    slug = re.sub(r"[^a-z0-9]+", separator, roman)
+    slug = _RE_NON_ALNUM_LOWER.sub(separator, roman)
     return slug.strip(separator)
 
 
@@ -154,16 +192,16 @@ def to_slug(title: str, separator: str = "-") -> str:
 # Rules: a-z 0-9 _ .  |  max 30 chars  |  no consecutive dots, no dot at start/end
 
 def _clean_ig(text: str) -> str:
-    return re.sub(r"[^a-z0-9_.]", "", text.lower())
+    return _RE_NON_IG.sub("", text.lower())
 
 def _ig_safe(handle: str) -> str:
-    handle = re.sub(r"\.{2,}", ".", handle)
+    handle = _RE_DOT_RUN.sub(".", handle)
     return handle.strip(".")[:30]
 
 def generate_ig_handle(title: str, prefix: str = "stage") -> str:
     """'Banswara' → 'stage.banswara'"""
     roman = _to_roman(title)
-    words = re.split(r"[^a-z0-9]+", roman)
+    words = _RE_NON_ALNUM_LOWER.split(roman)
     core  = "".join(w for w in words if w)
     core  = _clean_ig(core)
     prefix = _clean_ig(prefix)
@@ -175,12 +213,12 @@ def generate_ig_handle(title: str, prefix: str = "stage") -> str:
 # Rules: a-z A-Z 0-9 .  |  max 50 chars  |  min 5 chars
 
 def _clean_fb(text: str) -> str:
-    return re.sub(r"[^a-zA-Z0-9.]", "", text)
+    return _RE_NON_FB.sub("", text)
 
 def generate_fb_username(title: str, prefix: str = "Stage") -> str:
     """'Banswara Ki Kahani' → 'StageBanswadaKiKahani'"""
     roman = _to_roman(title)
-    words = re.split(r"[^a-z0-9]+", roman)
+    words = _RE_NON_ALNUM_LOWER.split(roman)
     core  = "".join(w.capitalize() for w in words if w)
     username = _clean_fb(f"{prefix}{core}")
     username = username[:50]
@@ -199,14 +237,14 @@ def generate_fb_page_name(title: str, prefix: str = "STAGE") -> str:
 # Handle rules: a-z A-Z 0-9 _ - .  |  max 30 chars  |  min 3 chars
 
 def _clean_yt_handle(text: str) -> str:
-    text = re.sub(r"[^a-zA-Z0-9_.\-]", "", text)
-    text = re.sub(r"\.{2,}", ".", text)
+    text = _RE_NON_YT.sub("", text)
+    text = _RE_DOT_RUN.sub(".", text)
     return text.strip(".-")
 
 def generate_yt_handle(title: str, prefix: str = "Stage") -> str:
     """'Banswara' → 'StagebanSwara' → sanitized to '@StageBanswara'"""
     roman = _to_roman(title)
-    words = re.split(r"[^a-z0-9]+", roman)
+    words = _RE_NON_ALNUM_LOWER.split(roman)
     core  = "".join(w.capitalize() for w in words if w)
     handle = _clean_yt_handle(f"{prefix}{core}")
     handle = handle[:30]
@@ -223,6 +261,7 @@ def generate_yt_channel_name(title: str, prefix: str = "STAGE") -> str:
 
 # ── Main entry point ─────────────────────────────────────────────────────────
 
+@lru_cache(maxsize=4096)
 def generate_handles(title: str, brand_prefix: str = "STAGE") -> SocialHandles:
     """
     Generate all social media handles for a given title.
@@ -232,7 +271,8 @@ def generate_handles(title: str, brand_prefix: str = "STAGE") -> SocialHandles:
         brand_prefix: Brand name (default "STAGE")
 
     Returns:
-        SocialHandles dataclass with all platform handles.
+        SocialHandles dataclass with all platform handles. Results are cached
+        per (title, brand_prefix) — treat the returned object as read-only.
 
     Examples:
         generate_handles("Banswara")
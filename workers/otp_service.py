@@ -13,14 +13,46 @@ Usage:
 """
 
 import time
+import random
 import logging
 import requests
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Union
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from workers._http_cache import cached
 
 log = logging.getLogger(__name__)
 
 
+def _session(headers: Optional[dict] = None) -> requests.Session:
+    """Keep-alive session for one client — wait_for_otp polls the same host ~30 times."""
+    s = requests.Session()
+    if headers:
+        s.headers.update(headers)
+    s.mount("https://", HTTPAdapter(
+        pool_connections=2, pool_maxsize=10,
+        max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+    ))
+    return s
+
+
+# cancel/confirm stay synchronous (a CLI run may exit right after — the refund/billing
+# call must have gone out), but nobody reads the response, so keep the wait short
+_STATUS_TIMEOUT_S = 5
+
+
+_OTP_FIRST_POLL_S = 4.0
+
+def _next_poll_interval(interval: float, poll_interval: float, conn_error: bool) -> float:
+    """×1.5 up to poll_interval with ±20% jitter; double (≤60s) while the provider is unreachable."""
+    if conn_error:
+        return min(interval * 2, 60.0)
+    return min(interval * 1.5, poll_interval) * random.uniform(0.8, 1.2)
+
+
 @dataclass
 class OTPResult:
     success:    bool
@@ -43,10 +75,10 @@ class SMSManClient:
 
     def __init__(self, api_key: str):
         self.api_key = api_key
-        self._instagram_app_id: Optional[int] = None
+        self.session = _session()
 
     def _get(self, action: str, **params) -> dict:
-        r = requests.get(
+        r = self.session.get(
             f"{self.BASE}/{action}",
             params={"token": self.api_key, **params},
             timeout=15,
@@ -58,14 +90,7 @@ class SMSManClient:
         return data
 
     def _get_instagram_app_id(self) -> int:
-        if self._instagram_app_id:
-            return self._instagram_app_id
-        apps = self._get("applications")
-        for app in apps:
-            if "instagram" in app.get("name", "").lower():
-                self._instagram_app_id = int(app["id"])
-                return self._instagram_app_id
-        raise RuntimeError("Instagram not found in SMS-Man application list")
+        return _fetch_instagram_app_id(self.api_key)
 
     def get_number(self, country_id: int = 14) -> tuple[str, str]:
         """
@@ -83,10 +108,13 @@ class SMSManClient:
         poll_interval: int = 10,
         max_wait:      int = 300,
     ) -> Optional[str]:
-        """Poll for OTP code. Returns code or None on timeout."""
-        attempts = max_wait // poll_interval
-        for _ in range(attempts):
-            time.sleep(poll_interval)
+        """Poll for OTP code (backoff from ~4s up to poll_interval). Returns code or None on timeout."""
+        elapsed, interval = 0.0, _OTP_FIRST_POLL_S
+        while elapsed < max_wait:
+            interval = min(interval, max_wait - elapsed)
+            time.sleep(interval)
+            elapsed += interval
+            conn_error = False
             try:
                 data = self._get("get-sms", request_id=request_id)
                 code = data.get("sms_code")
@@ -97,21 +125,44 @@ class SMSManClient:
                 if err not in ("wait_sms", ""):
                     log.warning(f"SMS-Man unexpected status: {data}")
                     return None
+            except requests.exceptions.ConnectionError as e:
+                log.warning(f"SMS-Man poll error: {e}")
+                conn_error = True
             except Exception as e:
                 log.warning(f"SMS-Man poll error: {e}")
+            interval = _next_poll_interval(interval, poll_interval, conn_error)
         return None
 
-    def cancel(self, request_id: str):
+    def _set_status(self, request_id: str, status: str):
         try:
-            self._get("set-status", request_id=request_id, status="reject")
-        except Exception:
-            pass
+            self.session.get(
+                f"{self.BASE}/set-status",
+                params={"token": self.api_key, "request_id": request_id, "status": status},
+                timeout=_STATUS_TIMEOUT_S,
+            )
+        except Exception as e:
+            log.debug(f"SMS-Man set-status {status} failed: {e}")
+
+    def cancel(self, request_id: str):
+        self._set_status(request_id, "reject")
 
     def confirm(self, request_id: str):
-        try:
-            self._get("set-status", request_id=request_id, status="success")
-        except Exception:
-            pass
+        self._set_status(request_id, "success")
+
+
+@lru_cache(maxsize=4)
+@cached(ttl=3600)
+def _fetch_instagram_app_id(api_key: str) -> int:
+    """
+    Instagram's SMS-Man application_id, once per API key per process (and shared across
+    worker processes for an hour via the disk cache) — get_instagram_otp builds a
+    fresh client per call, so a per-instance cache never hit.
+    """
+    apps   = SMSManClient(api_key)._get("applications")
+    app_id = next((int(a["id"]) for a in apps if "instagram" in a.get("name", "").lower()), None)
+    if app_id is None:
+        raise RuntimeError("Instagram not found in SMS-Man application list")
+    return app_id
 
 
 # ── 5sim.net ──────────────────────────────────────────────────────────────────
@@ -129,9 +180,10 @@ class FiveSimClient:
             "Authorization": f"Bearer {api_key}",
             "Accept":        "application/json",
         }
+        self.session = _session(self.headers)
 
     def _get(self, path: str) -> dict:
-        r = requests.get(f"{self.BASE}{path}", headers=self.headers, timeout=15)
+        r = self.session.get(f"{self.BASE}{path}", timeout=15)
         r.raise_for_status()
         return r.json()
 
@@ -149,10 +201,13 @@ class FiveSimClient:
         poll_interval: int = 10,
         max_wait:      int = 300,
     ) -> Optional[str]:
-        """Poll for OTP. Returns code or None."""
-        attempts = max_wait // poll_interval
-        for _ in range(attempts):
-            time.sleep(poll_interval)
+        """Poll for OTP (backoff from ~4s up to poll_interval). Returns code or None."""
+        elapsed, interval = 0.0, _OTP_FIRST_POLL_S
+        while elapsed < max_wait:
+            interval = min(interval, max_wait - elapsed)
+            time.sleep(interval)
+            elapsed += interval
+            conn_error = False
             try:
                 data   = self._get(f"/user/check/{order_id}")
                 status = data.get("status", "")
@@ -165,29 +220,47 @@ class FiveSimClient:
                 elif status in ("CANCELED", "TIMEOUT", "BANNED"):
                     log.warning(f"5sim order {order_id} ended with status: {status}")
                     return None
+            except requests.exceptions.ConnectionError as e:
+                log.warning(f"5sim poll error: {e}")
+                conn_error = True
             except Exception as e:
                 log.warning(f"5sim poll error: {e}")
+            interval = _next_poll_interval(interval, poll_interval, conn_error)
         return None
 
     def cancel(self, order_id: str):
         try:
-            requests.get(f"{self.BASE}/user/cancel/{order_id}", headers=self.headers, timeout=10)
-        except Exception:
-            pass
+            self.session.get(f"{self.BASE}/user/cancel/{order_id}", timeout=_STATUS_TIMEOUT_S)
+        except Exception as e:
+            log.debug(f"5sim cancel failed: {e}")
 
     def confirm(self, order_id: str):
         try:
-            requests.get(f"{self.BASE}/user/finish/{order_id}", headers=self.headers, timeout=10)
-        except Exception:
-            pass
+            self.session.get(f"{self.BASE}/user/finish/{order_id}", timeout=_STATUS_TIMEOUT_S)
+        except Exception as e:
+            log.debug(f"5sim finish failed: {e}")
 
 
 # ── Unified interface ─────────────────────────────────────────────────────────
 
+# service → (client class, get_number call); one code path for every provider
+_CLIENTS = {
+    "smsman":  (SMSManClient,  lambda client, country: client.get_number(country_id=country)),
+    "fivesim": (FiveSimClient, lambda client, country: client.get_number(country=country)),
+}
+_DEFAULT_COUNTRY = {"smsman": 14, "fivesim": "india"}   # India
+_SERVICE_LABEL   = {"smsman": "SMS-Man", "fivesim": "5sim"}
+
+@lru_cache(maxsize=1)
+def _otp_settings() -> tuple[str, str, str]:
+    """(SMSMAN_API_KEY, FIVESIM_API_KEY, OTP_SERVICE) — imported once, on first use."""
+    from config.settings import SMSMAN_API_KEY, FIVESIM_API_KEY, OTP_SERVICE
+    return SMSMAN_API_KEY, FIVESIM_API_KEY, OTP_SERVICE
+
 def get_instagram_otp(
     service:       str = "smsman",
     api_key:       str = "",
-    country:             = None,
+    country:       Union[int, str, None] = None,
     poll_interval: int = 10,
     max_wait:      int = 300,
 ) -> OTPResult:
@@ -205,57 +278,34 @@ def get_instagram_otp(
         OTPResult with success, phone, otp, request_id
     """
     if not api_key:
-        from config.settings import SMSMAN_API_KEY, FIVESIM_API_KEY, OTP_SERVICE
-        service = service or OTP_SERVICE
-        api_key = SMSMAN_API_KEY if service == "smsman" else FIVESIM_API_KEY
+        smsman_key, fivesim_key, default_service = _otp_settings()
+        service = service or default_service
+        api_key = smsman_key if service == "smsman" else fivesim_key
+
+    if service not in _CLIENTS:
+        return OTPResult(success=False, error=f"Unknown OTP service: {service}")
+    client_cls, get_number = _CLIENTS[service]
+    client  = client_cls(api_key)
+    country = _DEFAULT_COUNTRY[service] if country is None else country
+    label   = _SERVICE_LABEL[service]
 
     request_id = None
 
     try:
-        if service == "smsman":
-            client     = SMSManClient(api_key)
-            country_id = country if country is not None else 14  # India
-            log.info(f"SMS-Man: requesting India number for Instagram...")
-            request_id, phone = client.get_number(country_id=country_id)
-            log.info(f"SMS-Man: got number {phone} (request_id={request_id})")
-
-            otp = client.wait_for_otp(request_id, poll_interval, max_wait)
-            if otp:
-                client.confirm(request_id)
-                return OTPResult(success=True, phone=phone, otp=otp, request_id=request_id, service="smsman")
-            else:
-                client.cancel(request_id)
-                return OTPResult(success=False, phone=phone, error="OTP not received within timeout", service="smsman")
-
-        elif service == "fivesim":
-            client      = FiveSimClient(api_key)
-            country_str = country if country is not None else "india"
-            log.info(f"5sim: requesting {country_str} number for Instagram...")
-            request_id, phone = client.get_number(country=country_str)
-            log.info(f"5sim: got number {phone} (order_id={request_id})")
-
-            otp = client.wait_for_otp(request_id, poll_interval, max_wait)
-            if otp:
-                client.confirm(request_id)
-                return OTPResult(success=True, phone=phone, otp=otp, request_id=request_id, service="fivesim")
-            else:
-                client.cancel(request_id)
-                return OTPResult(success=False, phone=phone, error="OTP not received within timeout", service="fivesim")
-
-        else:
-            return OTPResult(success=False, error=f"Unknown OTP service: {service}")
+        log.info(f"{label}: requesting {country} number for Instagram...")
+        request_id, phone = get_number(client, country)
+        log.info(f"{label}: got number {phone} (request_id={request_id})")
+
+        otp = client.wait_for_otp(request_id, poll_interval, max_wait)
+        if otp:
+            client.confirm(request_id)
+            return OTPResult(success=True, phone=phone, otp=otp, request_id=request_id, service=service)
+        client.cancel(request_id)
+        return OTPResult(success=False, phone=phone, error="OTP not received within timeout", service=service)
 
     except Exception as e:
         log.error(f"OTP service error: {e}")
         # Attempt to cancel if we got a request_id
-        if request_id and service == "smsman":
-            try:
-                SMSManClient(api_key).cancel(request_id)
-            except Exception:
-                pass
-        elif request_id and service == "fivesim":
-            try:
-                FiveSimClient(api_key).cancel(request_id)
-            except Exception:
-                pass
+        if request_id:
+            client.cancel(request_id)
         return OTPResult(success=False, error=str(e))
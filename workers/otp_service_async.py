@@ -0,0 +1,154 @@
+"""
+workers/otp_service_async.py — One async poller for many concurrent Instagram OTP waits
+
+get_instagram_otp() blocks a thread in its own sleep/poll loop for up to 5 minutes.
+When several accounts are created in parallel, OTPPoller keeps every outstanding
+order in one dict and checks all of them together on each wake-up. It uses a single
+event loop and one pooled HTTP client.
+
+Usage:
+    async with OTPPoller("smsman", api_key) as poller:
+        results = await asyncio.gather(*(get_instagram_otp_async(poller) for _ in range(n)))
+"""
+
+import asyncio
+import logging
+from typing import Optional, Union
+
+import httpx
+
+from workers.otp_service import _CLIENTS, _DEFAULT_COUNTRY, FiveSimClient, OTPResult, SMSManClient
+
+log = logging.getLogger(__name__)
+
+
+class OTPPoller:
+    """
+    Multiplexes OTP status checks for all pending orders of one provider account.
+    The background poll task runs only while something is waiting.
+    """
+
+    def __init__(self, service: str, api_key: str, poll_interval: float = 5.0):
+        self.service       = service
+        self.api_key       = api_key
+        self.poll_interval = poll_interval
+        self.pending: dict[str, asyncio.Future] = {}
+        self._task: Optional[asyncio.Task] = None
+        headers = {}
+        if service == "fivesim":
+            headers = {"Authorization": f"Bearer {api_key}", "Accept": "application/json"}
+        self.client = httpx.AsyncClient(
+            headers = headers,
+            timeout = 15,
+            limits  = httpx.Limits(max_connections=20, max_keepalive_connections=20, keepalive_expiry=60),
+        )
+
+    async def aclose(self):
+        if self._task:
+            self._task.cancel()
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def wait_for_otp(self, request_id: str, max_wait: int = 300) -> Optional[str]:
+        """Register an order with the shared poller. Returns code or None on timeout."""
+        fut = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = fut
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        try:
+            return await asyncio.wait_for(fut, max_wait)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self.pending.pop(request_id, None)
+
+    async def _run(self):
+        while self.pending:
+            await asyncio.sleep(self.poll_interval)
+            ids     = list(self.pending)
+            results = await asyncio.gather(*(self._check(rid) for rid in ids), return_exceptions=True)
+            for rid, res in zip(ids, results):
+                fut = self.pending.get(rid)
+                if fut is None or fut.done():
+                    continue
+                if isinstance(res, Exception):
+                    log.warning(f"{self.service} poll error ({rid}): {res}")
+                    continue
+                finished, code = res
+                if finished:
+                    fut.set_result(code)
+        self._task = None
+
+    async def _check(self, request_id: str) -> tuple[bool, Optional[str]]:
+        """(finished, code) for one order — same status handling as the sync clients."""
+        if self.service == "smsman":
+            r = await self.client.get(
+                f"{SMSManClient.BASE}/get-sms",
+                params={"token": self.api_key, "request_id": request_id},
+            )
+            r.raise_for_status()
+            data = r.json()
+            code = data.get("sms_code")
+            if code:
+                log.info(f"SMS-Man OTP received: {code}")
+                return True, str(code)
+            err = data.get("error_code", "")
+            if err not in ("wait_sms", ""):
+                log.warning(f"SMS-Man unexpected status: {data}")
+                return True, None
+            return False, None
+
+        r = await self.client.get(f"{FiveSimClient.BASE}/user/check/{request_id}")
+        r.raise_for_status()
+        data   = r.json()
+        status = data.get("status", "")
+        if status == "RECEIVED":
+            sms_list = data.get("sms", [])
+            if sms_list:
+                code = sms_list[0].get("code")
+                log.info(f"5sim OTP received: {code}")
+                return True, str(code)
+        elif status in ("CANCELED", "TIMEOUT", "BANNED"):
+            log.warning(f"5sim order {request_id} ended with status: {status}")
+            return True, None
+        return False, None
+
+
+async def get_instagram_otp_async(
+    poller:   OTPPoller,
+    country:  Union[int, str, None] = None,
+    max_wait: int = 300,
+) -> OTPResult:
+    """
+    Async get_instagram_otp. Buying the number and confirm/cancel are one-off calls, so
+    they reuse the sync client in a thread. The long wait goes through the shared poller.
+    """
+    service = poller.service
+    if service not in _CLIENTS:
+        return OTPResult(success=False, error=f"Unknown OTP service: {service}")
+    client_cls, get_number = _CLIENTS[service]
+    client  = client_cls(poller.api_key)
+    country = _DEFAULT_COUNTRY[service] if country is None else country
+
+    request_id = None
+    try:
+        request_id, phone = await asyncio.to_thread(get_number, client, country)
+        log.info(f"{service}: got number {phone} (request_id={request_id})")
+
+        otp = await poller.wait_for_otp(request_id, max_wait)
+        if otp:
+            await asyncio.to_thread(client.confirm, request_id)
+            return OTPResult(success=True, phone=phone, otp=otp, request_id=request_id, service=service)
+        await asyncio.to_thread(client.cancel, request_id)
+        return OTPResult(success=False, phone=phone, error="OTP not received within timeout", service=service)
+
+    except Exception as e:
+        log.error(f"OTP service error: {e}")
+        if request_id:
+            await asyncio.to_thread(client.cancel, request_id)
+        return OTPResult(success=False, error=str(e))
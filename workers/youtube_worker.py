@@ -25,7 +25,9 @@ import re
 import time
 import logging
 from dataclasses import dataclass
-from typing import Optional
+from functools import cache
+from typing import Callable, Optional
+from weakref import WeakKeyDictionary
 
 log = logging.getLogger(__name__)
 
@@ -79,85 +81,182 @@ _SUBMIT_SELECTORS = [
     '[aria-label="Create channel"]',
 ]
 
+_CREATE_NEW_CHANNEL_SELECTORS = [
+    'a:has-text("Create a new channel")',
+    'button:has-text("Create a new channel")',
+    '[href*="create_channel"]',
+]
+
+# Comma-joined once at import — one wait races every candidate instead of probing
+# them one by one. Keyed by list identity so the helpers keep taking plain lists.
+_UNION_SEL = {
+    id(sels): ", ".join(sels)
+    for sels in (
+        _CUSTOM_NAME_SELECTORS, _CHANNEL_NAME_SELECTORS, _TOS_CHECKBOX_SELECTORS,
+        _SUBMIT_SELECTORS, _CREATE_NEW_CHANNEL_SELECTORS,
+    )
+}
+# page → {id(selector list): locators} — dropped with the page
+_LOCATOR_CACHE: "WeakKeyDictionary" = WeakKeyDictionary()
+
 
 # ── Human behaviour helpers ───────────────────────────────────────────────────
 
+# Prebound — _delay / _human_type run hundreds of times per channel
+_uniform = random.uniform
+_randint = random.randint
+_sleep   = time.sleep
+
 def _delay(min_s: float = 0.8, max_s: float = 2.5):
-    time.sleep(random.uniform(min_s, max_s))
+    _sleep(_uniform(min_s, max_s))
 
 def _human_type(page, selector: str, text: str, delay_range=(80, 220)):
     el = page.locator(selector).first
     el.click()
     _delay(0.3, 0.6)
-    for char in text:
-        page.keyboard.type(char, delay=random.randint(*delay_range))
+    # Browser paces the keystrokes itself (still real key events); bursts of 3–7 chars,
+    # each with its own per-key delay, so the rhythm isn't one constant interval
+    lo, hi = delay_range
+    i = 0
+    while i < len(text):
+        n = _randint(3, 7)
+        el.press_sequentially(text[i:i + n], delay=_randint(lo, hi))
+        i += n
+        if i < len(text):
+            _delay(0.05, 0.15)
 
 def _human_scroll(page, pixels: Optional[int] = None):
     px = pixels or random.randint(50, 180)
     page.mouse.wheel(0, px)
     _delay(0.2, 0.6)
 
-def _find_and_click(page, selectors: list[str], timeout: int = 5000) -> bool:
-    for sel in selectors:
-        try:
-            loc = page.locator(sel).first
-            if loc.is_visible(timeout=timeout):
-                box = loc.bounding_box()
-                if box:
-                    tx = box["x"] + box["width"] / 2 + random.uniform(-4, 4)
-                    ty = box["y"] + box["height"] / 2 + random.uniform(-3, 3)
-                    page.mouse.move(tx, ty, steps=random.randint(5, 12))
-                    _delay(0.1, 0.3)
-                loc.click()
-                return True
-        except Exception:
-            continue
-    return False
+# is_visible() never waits (its timeout is ignored), so the probe below keeps the
+# same "is it there right now" semantics with a near-zero locator timeout.
+_PROBE_TIMEOUT_MS = 50
 
-def _find_selector(page, selectors: list[str], timeout: int = 5000) -> Optional[str]:
-    for sel in selectors:
+def _locators_for(page, selectors: list[str]):
+    """
+    (union locator, ((sel, locator.first), …)) for a module-level selector list —
+    built once per page and reused by every later waterfall on that page.
+    """
+    key = id(selectors)
+    if key not in _UNION_SEL:  # ad-hoc list: id() may be recycled, so don't cache it
+        return _build_locators(page, selectors, ", ".join(selectors))
+    per_page = _LOCATOR_CACHE.setdefault(page, {})
+    if key not in per_page:
+        per_page[key] = _build_locators(page, selectors, _UNION_SEL[key])
+    return per_page[key]
+
+def _build_locators(page, selectors: list[str], union: str):
+    return (
+        page.locator(f"{union} >> visible=true").first,
+        tuple((sel, page.locator(sel).first) for sel in selectors),
+    )
+
+def _find_locator(page, selectors: list[str], timeout: int = 5000):
+    """
+    Wait once (up to timeout) for any candidate to be visible, then return the
+    highest-priority (sel, locator) that is. The union alone would pick by DOM order,
+    and late fallbacks like 'input[type="text"]' also match the masthead search box.
+    """
+    any_visible, candidates = _locators_for(page, selectors)
+    try:
+        any_visible.wait_for(state="visible", timeout=timeout)
+    except Exception:
+        return None
+    for sel, loc in candidates:
         try:
-            if page.locator(sel).first.is_visible(timeout=timeout):
-                return sel
+            if loc.is_visible():
+                return sel, loc
         except Exception:
             continue
     return None
 
+def _any_visible(page, selectors: list[str], timeout: int = 5000) -> bool:
+    """Presence-only check: the union wait alone, one RPC — no priority pass."""
+    try:
+        _locators_for(page, selectors)[0].wait_for(state="visible", timeout=timeout)
+        return True
+    except Exception:
+        return False
 
-# ── Channel ID extraction ─────────────────────────────────────────────────────
+def _find_and_click(page, selectors: list[str], timeout: int = 5000) -> bool:
+    found = _find_locator(page, selectors, timeout=timeout)
+    if not found:
+        return False
+    try:
+        loc = found[1]
+        # bounding_box() is None for hidden elements, so it doubles as the visibility check
+        box = loc.bounding_box(timeout=_PROBE_TIMEOUT_MS)
+        if not box:
+            return False
+        tx = box["x"] + box["width"] / 2 + random.uniform(-4, 4)
+        ty = box["y"] + box["height"] / 2 + random.uniform(-3, 3)
+        page.mouse.move(tx, ty, steps=random.randint(5, 12))
+        _delay(0.1, 0.3)
+        loc.click(timeout=timeout)
+        return True
+    except Exception:
+        return False
 
-def _extract_channel_id(url: str, content: str) -> Optional[str]:
-    """Extract YouTube channel ID (UCxxxxxxxx) from URL or page source."""
-    # Pattern 1: /channel/UCxxxxxxxx in URL
-    m = re.search(r"/channel/(UC[a-zA-Z0-9_-]{22})", url)
-    if m:
-        return m.group(1)
+def _find_selector(page, selectors: list[str], timeout: int = 5000) -> Optional[str]:
+    found = _find_locator(page, selectors, timeout=timeout)
+    return found[0] if found else None
 
-    # Pattern 2: YouTube Studio URL
-    m = re.search(r"studio\.youtube\.com/channel/(UC[a-zA-Z0-9_-]{22})", url)
-    if m:
-        return m.group(1)
 
-    # Pattern 3: Scan page source
-    m = re.search(r'"channelId":\s*"(UC[a-zA-Z0-9_-]{22})"', content)
-    if m:
-        return m.group(1)
+# ── Channel ID extraction ─────────────────────────────────────────────────────
 
-    m = re.search(r'"externalId":\s*"(UC[a-zA-Z0-9_-]{22})"', content)
-    if m:
-        return m.group(1)
+# Compiled once at import. /channel/UC… covers both youtube.com and studio.youtube.com
+# URLs. Bare /channel/ links in the page source are not used — guide, subscription and
+# recommendation links point at other channels; a miss falls through to Studio instead.
+_RE_CHANNEL_ID_URL  = re.compile(r"/channel/(UC[a-zA-Z0-9_-]{22})")
+_RE_CHANNEL_ID_JSON = re.compile(r'"channelId"\s*:\s*"(UC[a-zA-Z0-9_-]{22})"')
+_RE_EXTERNAL_ID     = re.compile(r'"externalId"\s*:\s*"(UC[a-zA-Z0-9_-]{22})"')
+_RE_HANDLE_URL      = re.compile(r"youtube\.com/@([a-zA-Z0-9_.\-]+)")
+_RE_HANDLE_JSON     = re.compile(r'"vanityUrls":\["@([a-zA-Z0-9_.\-]+)"\]')
+
+# ytd-button-renderer:has-text("Sign in") in plain DOM terms — :has-text is Playwright-only
+_SIGNIN_STATE_JS = """() => ({
+    url:       location.href,
+    signedOut: !!document.querySelector('a[href*="accounts.google.com/ServiceLogin"]')
+               || [...document.querySelectorAll("ytd-button-renderer")]
+                      .some((b) => /sign\\s+in/i.test(b.textContent)),
+})"""
+
+# Reads the channel id/handle straight from YouTube's page globals — returns a few
+# bytes instead of serializing the whole DOM through page.content()
+_CHANNEL_INFO_JS = """() => {
+    const ok   = (id) => typeof id === "string" && /^UC[\\w-]{22}$/.test(id) ? id : null;
+    const cfg  = (window.ytcfg && ytcfg.data_) || {};
+    const meta = window.ytInitialData?.metadata?.channelMetadataRenderer || {};
+    return {
+        url:       location.href,
+        channelId: ok(cfg.CHANNEL_ID) || ok(meta.externalId),
+        vanity:    meta.vanityChannelUrl || null,
+    };
+}"""
+
+# Extractors take the page source as a callable: page.content() is multi-MB and is
+# only fetched when the URL alone doesn't already answer.
+
+def _extract_channel_id(url: str, get_content: Callable[[], str]) -> Optional[str]:
+    """Extract YouTube channel ID (UCxxxxxxxx) from URL or page source."""
+    m = _RE_CHANNEL_ID_URL.search(url)
+    if not m:
+        # channelId beats externalId regardless of which appears first in the source
+        content = get_content()
+        m = _RE_CHANNEL_ID_JSON.search(content) or _RE_EXTERNAL_ID.search(content)
+    return m.group(1) if m else None
+
+def _extract_handle(url: str, get_content: Callable[[], str]) -> Optional[str]:
+    """Extract @handle from URL or page source after channel creation."""
+    m = _RE_HANDLE_URL.search(url) or _RE_HANDLE_JSON.search(get_content())
+    return f"@{m.group(1)}" if m else None
 
-    return None
 
-def _extract_handle(url: str, content: str) -> Optional[str]:
-    """Extract @handle from URL or page source after channel creation."""
-    m = re.search(r"youtube\.com/@([a-zA-Z0-9_.\-]+)", url)
-    if m:
-        return f"@{m.group(1)}"
-    m = re.search(r'"vanityUrls":\["@([a-zA-Z0-9_.\-]+)"\]', content)
-    if m:
-        return f"@{m.group(1)}"
-    return None
+def _is_post_create_url(url: str) -> bool:
+    """Left the create/switcher flow and landed on YouTube (or Studio)."""
+    return "youtube.com" in url and "create_channel" not in url and "channel_switcher" not in url
 
 
 # ── Get channel ID from Studio ────────────────────────────────────────────────
@@ -167,13 +266,8 @@ def _get_id_from_studio(page) -> Optional[str]:
     try:
         page.goto("https://studio.youtube.com/", wait_until="domcontentloaded", timeout=30000)
         _delay(2.0, 3.0)
-        channel_id = _extract_channel_id(page.url, page.content())
-        if not channel_id:
-            # Try: studio.youtube.com/channel/UCxxx
-            m = re.search(r"studio\.youtube\.com/channel/(UC[a-zA-Z0-9_-]{22})", page.url)
-            if m:
-                channel_id = m.group(1)
-        return channel_id
+        # _extract_channel_id already checks studio.youtube.com/channel/UCxxx in the URL
+        return _extract_channel_id(page.url, page.content)
     except Exception as e:
         log.warning(f"Could not get channel ID from Studio: {e}")
         return None
@@ -181,33 +275,50 @@ def _get_id_from_studio(page) -> Optional[str]:
 
 # ── Main worker ───────────────────────────────────────────────────────────────
 
-def create_youtube_channel(
-    channel_name: str,
-    cdp_url:      str = "http://localhost:9222",
-    screenshot_dir: Optional[str] = None,
-) -> YTChannelResult:
-    """
-    Create a YouTube Brand Account channel using an existing Chrome session.
-
-    Args:
-        channel_name:   Display name, e.g. "STAGE Banswara Ki Kahani"
-        cdp_url:        Chrome DevTools Protocol URL
-        screenshot_dir: If set, saves screenshots on completion/failure
-
-    Returns:
-        YTChannelResult with success, channel_id, channel_url, handle, error
-    """
+def _sync_playwright():
     try:
         from patchright.sync_api import sync_playwright
         log.info("Using patchright (Shadow DOM + stealth support)")
     except ImportError:
         from playwright.sync_api import sync_playwright
         log.warning("patchright not installed — Shadow DOM selectors may fail")
+    return sync_playwright
+
 
-    with sync_playwright() as p:
-        log.info(f"Connecting to Chrome at {cdp_url}")
-        browser = p.chromium.connect_over_cdp(cdp_url)
-        context = browser.contexts[0]
+class YouTubeSession:
+    """
+    One Playwright driver + CDP connection to the debug Chrome, reused across channels.
+
+        with YouTubeSession() as yt:
+            yt.create_channel("STAGE Banswara")
+            ...                                 # (10+ min apart — YT rate limit)
+            yt.create_channel("STAGE Kota Ke Kisse")
+    """
+
+    def __init__(self, cdp_url: str = "http://localhost:9222"):
+        self.cdp_url  = cdp_url
+        self._pw      = None
+        self.browser  = None
+        self._page    = None
+
+    def __enter__(self):
+        self._pw = _sync_playwright()().start()
+        try:
+            log.info(f"Connecting to Chrome at {self.cdp_url}")
+            self.browser = self._pw.chromium.connect_over_cdp(self.cdp_url)
+        except Exception:
+            self._pw.stop()
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        self._pw.stop()
+
+    def _get_page(self):
+        """Working tab — picked once per session, re-picked only if it was closed."""
+        if self._page is not None and not self._page.is_closed():
+            return self._page
+        context = self.browser.contexts[0]
         # Reuse existing page (avoids ERR_NAME_NOT_RESOLVED on new pages in debug Chrome)
         if len(context.pages) > 1:
             page = context.pages[1]  # Use Google tab
@@ -219,6 +330,17 @@ def create_youtube_channel(
         page.add_init_script(
             "Object.defineProperty(navigator, 'webdriver', { get: () => undefined });"
         )
+        self._page = page
+        return page
+
+    def create_channel(
+        self,
+        channel_name:   str,
+        screenshot_dir: Optional[str] = None,
+        reset_tab:      bool = False,
+    ) -> YTChannelResult:
+        """Create one Brand Account channel — see create_youtube_channel()."""
+        page = self._get_page()
 
         try:
             # ── Step 1: Verify Google/YT session ──────────────────────────
@@ -226,12 +348,12 @@ def create_youtube_channel(
             page.goto("https://www.youtube.com/", wait_until="domcontentloaded", timeout=30000)
             _delay(2.0, 4.0)
 
-            if "accounts.google.com" in page.url or "signin" in page.url.lower():
+            # URL + sign-in button (logged out state) in one round-trip
+            state = page.evaluate(_SIGNIN_STATE_JS)
+            if "accounts.google.com" in state["url"] or "signin" in state["url"].lower():
                 return YTChannelResult(success=False, error="Google session expired — run: python scripts/login_helper.py")
 
-            # Check for sign-in button (logged out state)
-            signin_visible = page.locator('a[href*="accounts.google.com/ServiceLogin"], ytd-button-renderer:has-text("Sign in")').count() > 0
-            if signin_visible:
+            if state["signedOut"]:
                 if screenshot_dir:
                     page.screenshot(path=f"{screenshot_dir}/yt_not_logged_in.png")
                 return YTChannelResult(success=False, error="YouTube not logged in (Sign in button visible) — run: python scripts/login_helper.py")
@@ -246,19 +368,14 @@ def create_youtube_channel(
                 log.info("Trying channel_switcher fallback...")
                 page.goto("https://www.youtube.com/channel_switcher", wait_until="domcontentloaded", timeout=30000)
                 _delay(2.0, 3.5)
-                _find_and_click(page, [
-                    'a:has-text("Create a new channel")',
-                    'button:has-text("Create a new channel")',
-                    '[href*="create_channel"]',
-                ], timeout=5000)
+                _find_and_click(page, _CREATE_NEW_CHANNEL_SELECTORS, timeout=5000)
                 _delay(2.0, 3.0)
 
             # ── Step 3: Click "Use a custom name" (Brand Account) ──────────
             log.info("Selecting 'Use a custom name' (Brand Account)...")
             if not _find_and_click(page, _CUSTOM_NAME_SELECTORS, timeout=8000):
                 # Some accounts skip straight to the name input — check
-                name_sel = _find_selector(page, _CHANNEL_NAME_SELECTORS, timeout=3000)
-                if not name_sel:
+                if not _any_visible(page, _CHANNEL_NAME_SELECTORS, timeout=3000):
                     if screenshot_dir:
                         page.screenshot(path=f"{screenshot_dir}/yt_no_dialog.png")
                     return YTChannelResult(success=False, error="Could not find 'Use a custom name' button or name input")
@@ -277,8 +394,7 @@ def create_youtube_channel(
             _delay(0.8, 1.5)
 
             # ── Step 5: Accept TOS checkbox (if shown) ─────────────────────
-            tos_sel = _find_selector(page, _TOS_CHECKBOX_SELECTORS, timeout=3000)
-            if tos_sel:
+            if _any_visible(page, _TOS_CHECKBOX_SELECTORS, timeout=3000):
                 log.info("TOS checkbox found — clicking...")
                 _find_and_click(page, _TOS_CHECKBOX_SELECTORS)
                 _delay(0.5, 1.0)
@@ -296,22 +412,27 @@ def create_youtube_channel(
 
             # ── Step 8: Wait for redirect ──────────────────────────────────
             log.info("Waiting for channel creation redirect...")
-            for _ in range(30):
-                _delay(1.0, 1.0)
-                current_url = page.url
-                if "create_channel" not in current_url and "channel_switcher" not in current_url:
-                    if "youtube.com" in current_url or "studio.youtube.com" in current_url:
-                        break
-            else:
+            # Browser-side wait — returns on the navigation itself, no 1s page.url polling
+            try:
+                page.wait_for_url(_is_post_create_url, wait_until="commit", timeout=30000)
+            except Exception:
                 return YTChannelResult(success=False, error="Timed out waiting for redirect after channel creation")
 
             _delay(2.0, 4.0)
-            current_url = page.url
-            content     = page.content()
 
             # ── Step 9: Extract channel ID ─────────────────────────────────
-            channel_id = _extract_channel_id(current_url, content)
-            handle     = _extract_handle(current_url, content)
+            # One evaluate for URL + page globals; full page source only if that misses,
+            # and then fetched once for both extractors. The post-create URL is authoritative —
+            # ytcfg can still describe the session's previous identity, so it only comes second.
+            info        = page.evaluate(_CHANNEL_INFO_JS)
+            current_url = info["url"]
+            get_content = cache(page.content)
+            m           = _RE_CHANNEL_ID_URL.search(current_url)
+            if m:
+                channel_id = m.group(1)
+            else:
+                channel_id = info["channelId"] or _extract_channel_id(current_url, get_content)
+            handle      = _extract_handle(info["vanity"] or current_url, get_content)
 
             if not channel_id:
                 log.info("Channel ID not in URL — checking YouTube Studio...")
@@ -345,11 +466,36 @@ def create_youtube_channel(
             return YTChannelResult(success=False, error=str(e))
 
         finally:
-            # Navigate back to YouTube homepage to keep the tab alive for next run
-            try:
-                page.evaluate("() => { window.location.href = 'https://www.youtube.com/'; }")
-            except Exception:
-                pass
+            # The next run starts with its own goto, so the tab is left where it is by
+            # default — reloading YouTube here only cost MBs of traffic + page JS
+            if reset_tab:
+                try:
+                    page.goto("about:blank", timeout=5000)
+                except Exception:
+                    pass
+
+
+def create_youtube_channel(
+    channel_name: str,
+    cdp_url:      str = "http://localhost:9222",
+    screenshot_dir: Optional[str] = None,
+    reset_tab:      bool = False,
+) -> YTChannelResult:
+    """
+    Create a YouTube Brand Account channel using an existing Chrome session.
+    For several channels in one run, use YouTubeSession directly.
+
+    Args:
+        channel_name:   Display name, e.g. "STAGE Banswara Ki Kahani"
+        cdp_url:        Chrome DevTools Protocol URL
+        screenshot_dir: If set, saves screenshots on completion/failure
+        reset_tab:      If True, park the tab on about:blank afterwards
+
+    Returns:
+        YTChannelResult with success, channel_id, channel_url, handle, error
+    """
+    with YouTubeSession(cdp_url) as yt:
+        return yt.create_channel(channel_name, screenshot_dir=screenshot_dir, reset_tab=reset_tab)
 
 
 # ── CLI test ──────────────────────────────────────────────────────────────────